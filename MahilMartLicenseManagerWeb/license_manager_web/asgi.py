@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'license_manager_web.settings')
 
 application = get_asgi_application()
+
+# Keys are only queued for MongoDB by requests; the outbox worker (and the
+# prewarm and mirror workers) must run in every server process.
+from licenses.services import start_background_workers  # noqa: E402
+
+start_background_workers()
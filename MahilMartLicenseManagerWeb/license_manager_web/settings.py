@@ -136,6 +136,84 @@ LICENSE_MONGO_COLLECTION = (
     os.environ.get("MAHILMARTPOS_LICENSE_MONGO_COLLECTION")
     or "license_keys"
 ).strip()
+try:
+    LICENSE_MONGO_MAX_POOL_SIZE = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_MONGO_MAX_POOL_SIZE") or "20").strip()
+    )
+except ValueError:
+    LICENSE_MONGO_MAX_POOL_SIZE = 20
+LICENSE_MONGO_OUTBOX_WORKER_ENABLED = (
+    os.environ.get("MAHILMARTPOS_LICENSE_MONGO_OUTBOX_WORKER_ENABLED") or "1"
+).strip() == "1"
+try:
+    LICENSE_MONGO_OUTBOX_POLL_SECONDS = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_MONGO_OUTBOX_POLL_SECONDS") or "5").strip()
+    )
+except ValueError:
+    LICENSE_MONGO_OUTBOX_POLL_SECONDS = 5
+try:
+    LICENSE_MONGO_WRITE_WINDOW_MS = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_MONGO_WRITE_WINDOW_MS") or "50").strip()
+    )
+except ValueError:
+    LICENSE_MONGO_WRITE_WINDOW_MS = 50
+try:
+    LICENSE_MONGO_WRITE_BATCH_SIZE = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_MONGO_WRITE_BATCH_SIZE") or "100").strip()
+    )
+except ValueError:
+    LICENSE_MONGO_WRITE_BATCH_SIZE = 100
+try:
+    LICENSE_MONGO_BREAKER_FAILURE_THRESHOLD = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_MONGO_BREAKER_FAILURE_THRESHOLD") or "3").strip()
+    )
+except ValueError:
+    LICENSE_MONGO_BREAKER_FAILURE_THRESHOLD = 3
+try:
+    LICENSE_MONGO_BREAKER_RESET_SECONDS = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_MONGO_BREAKER_RESET_SECONDS") or "30").strip()
+    )
+except ValueError:
+    LICENSE_MONGO_BREAKER_RESET_SECONDS = 30
+try:
+    LICENSE_MONGO_RECENT_CACHE_SECONDS = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_MONGO_RECENT_CACHE_SECONDS") or "15").strip()
+    )
+except ValueError:
+    LICENSE_MONGO_RECENT_CACHE_SECONDS = 15
+try:
+    LICENSE_MONGO_FETCH_DEADLINE_MS = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_MONGO_FETCH_DEADLINE_MS") or "800").strip()
+    )
+except ValueError:
+    LICENSE_MONGO_FETCH_DEADLINE_MS = 800
+LICENSE_MONGO_MIRROR_ENABLED = (
+    os.environ.get("MAHILMARTPOS_LICENSE_MONGO_MIRROR_ENABLED") or "0"
+).strip() == "1"
+try:
+    LICENSE_MONGO_MIRROR_INTERVAL_SECONDS = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_MONGO_MIRROR_INTERVAL_SECONDS") or "30").strip()
+    )
+except ValueError:
+    LICENSE_MONGO_MIRROR_INTERVAL_SECONDS = 30
+try:
+    LICENSE_SHARED_CONFIG_CHECK_SECONDS = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_SHARED_CONFIG_CHECK_SECONDS") or "2").strip()
+    )
+except ValueError:
+    LICENSE_SHARED_CONFIG_CHECK_SECONDS = 2
+try:
+    LICENSE_RUNTIME_CONFIG_MAX_AGE_SECONDS = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_RUNTIME_CONFIG_MAX_AGE_SECONDS") or "2").strip()
+    )
+except ValueError:
+    LICENSE_RUNTIME_CONFIG_MAX_AGE_SECONDS = 2
+try:
+    LICENSE_CHANGES_OVERLAP_SECONDS = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_CHANGES_OVERLAP_SECONDS") or "5").strip()
+    )
+except ValueError:
+    LICENSE_CHANGES_OVERLAP_SECONDS = 5
 try:
     LICENSE_KEY_VALIDITY_MINUTES = int(
         (os.environ.get("MAHILMARTPOS_LICENSE_KEY_VALIDITY_MINUTES") or "10").strip()
@@ -145,6 +223,44 @@ except ValueError:
 LICENSE_KEY_SEED_MODE = (
     os.environ.get("MAHILMARTPOS_LICENSE_KEY_SEED_MODE") or "windowed"
 ).strip().lower()
+try:
+    LICENSE_KEY_CACHE_SIZE = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_KEY_CACHE_SIZE") or "4096").strip()
+    )
+except ValueError:
+    LICENSE_KEY_CACHE_SIZE = 4096
+try:
+    LICENSE_KEY_VERIFY_PREVIOUS_WINDOWS = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_KEY_VERIFY_PREVIOUS_WINDOWS") or "1").strip()
+    )
+except ValueError:
+    LICENSE_KEY_VERIFY_PREVIOUS_WINDOWS = 1
+LICENSE_KEY_PREWARM_ENABLED = (
+    os.environ.get("MAHILMARTPOS_LICENSE_KEY_PREWARM_ENABLED") or "1"
+).strip() == "1"
+try:
+    LICENSE_KEY_PREWARM_LEAD_MINUTES = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_KEY_PREWARM_LEAD_MINUTES") or "2").strip()
+    )
+except ValueError:
+    LICENSE_KEY_PREWARM_LEAD_MINUTES = 2
+try:
+    LICENSE_KEY_PREWARM_WORKERS = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_KEY_PREWARM_WORKERS") or "2").strip()
+    )
+except ValueError:
+    LICENSE_KEY_PREWARM_WORKERS = 2
+LICENSE_API_TOKENS = [
+    token.strip()
+    for token in (os.environ.get("MAHILMARTPOS_LICENSE_API_TOKENS") or "").split(",")
+    if token.strip()
+]
+try:
+    LICENSE_API_BATCH_MAX = int(
+        (os.environ.get("MAHILMARTPOS_LICENSE_API_BATCH_MAX") or "500").strip()
+    )
+except ValueError:
+    LICENSE_API_BATCH_MAX = 500
 
 LOGIN_URL = "licenses:login"
 LOGIN_REDIRECT_URL = "licenses:dashboard"
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import GeneratedLicense, LicenseRuntimeConfig
+from .models import GeneratedLicense, LicenseRuntimeConfig, MongoSyncOutbox
 
 
 @admin.register(GeneratedLicense)
@@ -26,3 +26,16 @@ class LicenseRuntimeConfigAdmin(admin.ModelAdmin):
         "updated_at",
     )
     readonly_fields = ("created_at", "updated_at")
+
+
+@admin.register(MongoSyncOutbox)
+class MongoSyncOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        "machine_id",
+        "license_key",
+        "attempts",
+        "next_attempt_at",
+        "created_at",
+    )
+    search_fields = ("machine_id", "license_key")
+    readonly_fields = ("created_at", "updated_at")
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from licenses.services import drain_mongo_sync_outbox
+
+
+class Command(BaseCommand):
+    help = "Push queued license records from the Mongo sync outbox to MongoDB."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain due entries once and exit.")
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--poll-seconds", type=int, default=5)
+
+    def handle(self, *args, **options):
+        while True:
+            synced, failed = drain_mongo_sync_outbox(batch_size=options["batch_size"])
+            if synced or failed or options["once"]:
+                self.stdout.write(f"Mongo outbox: {synced} synced, {failed} failed.")
+            if options["once"]:
+                return
+            close_old_connections()
+            if not synced:
+                time.sleep(max(1, options["poll_seconds"]))
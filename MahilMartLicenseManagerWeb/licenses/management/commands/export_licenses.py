@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from licenses.services import (
+    LICENSE_EXPORT_FORMATS,
+    iter_license_export_lines,
+    iter_license_export_records,
+    open_mongo_export_cursor,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream every license record as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=LICENSE_EXPORT_FORMATS, default="csv")
+        parser.add_argument("--output", default="-", help="Output file, or - for stdout.")
+        parser.add_argument("--include-mongo", action="store_true", help="Merge in the Mongo collection.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        mongo_cursor = None
+        if options["include_mongo"]:
+            mongo_cursor, message = open_mongo_export_cursor(batch_size=options["chunk_size"])
+            if mongo_cursor is None:
+                raise CommandError(message)
+
+        records = iter_license_export_records(mongo_cursor, chunk_size=options["chunk_size"])
+        lines = iter_license_export_lines(records, options["format"], chunk_size=options["chunk_size"])
+        if options["output"] == "-":
+            for chunk in lines:
+                self.stdout.write(chunk, ending="")
+            return
+
+        try:
+            with open(options["output"], "w", encoding="utf-8", newline="") as handle:
+                for chunk in lines:
+                    handle.write(chunk)
+        except OSError as exc:
+            raise CommandError(f"Could not write {options['output']}: {exc}")
+        self.stderr.write(f"Exported licenses to {options['output']}.")
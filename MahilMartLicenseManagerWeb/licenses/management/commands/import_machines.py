@@ -0,0 +1,38 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from licenses.services import import_machine_licenses_csv
+
+
+class Command(BaseCommand):
+    help = "Generate license keys for every machine ID in a CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path", help="CSV file with a machine_id column, or - for stdin.")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--generated-by", default="import_machines")
+
+    def handle(self, *args, **options):
+        csv_path = options["csv_path"]
+        kwargs = {
+            "generated_by": options["generated_by"],
+            "chunk_size": options["chunk_size"],
+        }
+        try:
+            if csv_path == "-":
+                report = import_machine_licenses_csv(sys.stdin, **kwargs)
+            else:
+                with open(csv_path, encoding="utf-8-sig", newline="") as stream:
+                    report = import_machine_licenses_csv(stream, **kwargs)
+        except (OSError, UnicodeDecodeError, csv.Error) as exc:
+            raise CommandError(f"Could not read {csv_path}: {exc}")
+
+        for error in report["errors"]:
+            self.stderr.write(f"line {error['line']} ({error['machine_id'] or '-'}): {error['error']}")
+        if report["mongo_message"]:
+            self.stderr.write(report["mongo_message"])
+        self.stdout.write(
+            f"Imported {report['imported']} of {report['rows']} rows ({len(report['errors'])} errors)."
+        )
@@ -5,6 +5,8 @@ from django.contrib.staticfiles.management.commands.runserver import (
     Command as DjangoRunserverCommand,
 )
 
+from licenses.services import start_background_workers
+
 
 class Command(DjangoRunserverCommand):
     default_addr = "127.0.0.1"
@@ -50,3 +52,7 @@ class Command(DjangoRunserverCommand):
     def handle(self, *args, **options):
         options["addrport"] = self._normalize_addrport(options.get("addrport"))
         return super().handle(*args, **options)
+
+    def inner_run(self, *args, **options):
+        start_background_workers()
+        return super().inner_run(*args, **options)
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from licenses.services import sync_mongo_license_mirror
+
+
+class Command(BaseCommand):
+    help = "Pull new MongoDB license records into the local mirror table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run one incremental sync and exit.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--interval-seconds", type=int, default=30)
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                mirrored = sync_mongo_license_mirror(batch_size=options["batch_size"])
+            except Exception as exc:
+                if options["once"]:
+                    raise CommandError(f"Mongo mirror sync failed: {exc}")
+                self.stderr.write(f"Mongo mirror sync failed: {exc}")
+            else:
+                self.stdout.write(f"Mongo mirror: {mirrored} records updated.")
+            if options["once"]:
+                return
+            close_old_connections()
+            time.sleep(max(1, options["interval_seconds"]))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:45
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0003_licenseruntimeconfig'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MongoSyncOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('machine_id', models.CharField(db_index=True, max_length=64)),
+                ('license_key', models.CharField(max_length=64)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('next_attempt_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Mongo Sync Outbox Entry',
+                'verbose_name_plural': 'Mongo Sync Outbox',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0004_mongosyncoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MongoLicenseMirror',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('machine_id', models.CharField(max_length=64, unique=True)),
+                ('license_key', models.CharField(db_index=True, max_length=64)),
+                ('license_email', models.CharField(blank=True, max_length=254)),
+                ('customer_name', models.CharField(blank=True, max_length=120)),
+                ('contact_email', models.CharField(blank=True, max_length=254)),
+                ('note', models.TextField(blank=True)),
+                ('generated_by', models.CharField(blank=True, max_length=120)),
+                ('status', models.CharField(default='generated', max_length=32)),
+                ('source', models.CharField(blank=True, max_length=64)),
+                ('generated_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('valid_until', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('mirrored_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Mongo License Mirror',
+                'verbose_name_plural': 'Mongo License Mirror',
+                'ordering': ['-generated_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MongoMirrorState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target', models.CharField(max_length=64, unique=True)),
+                ('watermark', models.DateTimeField(blank=True, null=True)),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:54
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def collapse_duplicate_machine_licenses(apps, schema_editor):
+    GeneratedLicense = apps.get_model("licenses", "GeneratedLicense")
+    duplicated_machines = (
+        GeneratedLicense.objects.order_by()
+        .values("machine_id")
+        .annotate(row_count=Count("id"))
+        .filter(row_count__gt=1)
+        .values_list("machine_id", flat=True)
+    )
+    for machine_id in duplicated_machines.iterator():
+        records = GeneratedLicense.objects.filter(machine_id=machine_id).order_by(
+            "-generated_at", "-id"
+        )
+        primary_record = records.first()
+        records.exclude(pk=primary_record.pk).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0005_mongo_license_mirror'),
+    ]
+
+    operations = [
+        migrations.RunPython(collapse_duplicate_machine_licenses, migrations.RunPython.noop),
+    ]
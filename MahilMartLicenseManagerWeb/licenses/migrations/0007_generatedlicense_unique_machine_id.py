@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0006_collapse_duplicate_machine_licenses'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='generatedlicense',
+            name='generated_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='generatedlicense',
+            name='machine_id',
+            field=models.CharField(max_length=64, unique=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0007_generatedlicense_unique_machine_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='generatedlicense',
+            name='customer_name',
+            field=models.CharField(blank=True, db_index=True, max_length=120),
+        ),
+        migrations.AddIndex(
+            model_name='generatedlicense',
+            index=models.Index(fields=['generated_at', 'id'], name='license_generated_id_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0008_license_browser_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='generatedlicense',
+            name='valid_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='generatedlicense',
+            index=models.Index(fields=['valid_until', 'generated_at'], name='license_valid_until_gen_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:02
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import F
+
+
+def backfill_license_valid_until(apps, schema_editor):
+    GeneratedLicense = apps.get_model("licenses", "GeneratedLicense")
+    try:
+        validity_minutes = max(1, int(getattr(settings, "LICENSE_KEY_VALIDITY_MINUTES", 10)))
+    except (TypeError, ValueError):
+        validity_minutes = 10
+    GeneratedLicense.objects.filter(valid_until__isnull=True).update(
+        valid_until=F("generated_at") + timedelta(minutes=validity_minutes)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0009_license_validity_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_license_valid_until, migrations.RunPython.noop),
+    ]
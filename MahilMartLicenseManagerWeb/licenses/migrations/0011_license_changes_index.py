@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0010_backfill_license_valid_until'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='generatedlicense',
+            index=models.Index(fields=['updated_at', 'id'], name='license_updated_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0011_license_changes_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='generatedlicense',
+            name='valid_until',
+            field=models.DateTimeField(blank=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0012_generatedlicense_valid_until_not_null'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='generatedlicense',
+            name='license_key',
+            field=models.CharField(db_index=True, max_length=64),
+        ),
+    ]
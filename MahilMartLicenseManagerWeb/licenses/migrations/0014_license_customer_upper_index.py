@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:20
+
+from django.db import migrations
+
+
+# customer_name__istartswith compiles to UPPER(customer_name) LIKE UPPER(...)
+# on PostgreSQL, which the plain customer_name index cannot serve. SQLite has
+# no operator classes, so the index is PostgreSQL only.
+def create_customer_upper_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS license_customer_upper_idx "
+        "ON licenses_generatedlicense (UPPER(customer_name) varchar_pattern_ops)"
+    )
+
+
+def drop_customer_upper_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS license_customer_upper_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0013_generatedlicense_license_key_not_unique'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_customer_upper_index, drop_customer_upper_index),
+    ]
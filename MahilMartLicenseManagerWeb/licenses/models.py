@@ -1,27 +1,100 @@
+import itertools
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
 
 class GeneratedLicense(models.Model):
-    machine_id = models.CharField(max_length=64, db_index=True)
-    license_key = models.CharField(max_length=64, unique=True)
-    customer_name = models.CharField(max_length=120, blank=True)
+    machine_id = models.CharField(max_length=64, unique=True)
+    license_key = models.CharField(max_length=64, db_index=True)
+    customer_name = models.CharField(max_length=120, blank=True, db_index=True)
     contact_email = models.EmailField(blank=True)
     note = models.TextField(blank=True)
     generated_by = models.CharField(max_length=120, blank=True)
     status = models.CharField(max_length=32, default="generated")
     source = models.CharField(max_length=64, default="license_manager_web")
-    generated_at = models.DateTimeField(auto_now_add=True, db_index=True)
-    valid_until = models.DateTimeField(null=True, blank=True, db_index=True)
+    generated_at = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
+    valid_until = models.DateTimeField(blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-generated_at"]
+        indexes = [
+            models.Index(fields=["generated_at", "id"], name="license_generated_id_idx"),
+            models.Index(fields=["valid_until", "generated_at"], name="license_valid_until_gen_idx"),
+            models.Index(fields=["updated_at", "id"], name="license_updated_id_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.valid_until is None:
+            from .services import calculate_license_valid_until
+
+            self.valid_until = calculate_license_valid_until(self.generated_at)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.machine_id} :: {self.license_key}"
 
 
+class MongoSyncOutbox(models.Model):
+    machine_id = models.CharField(max_length=64, db_index=True)
+    license_key = models.CharField(max_length=64)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["id"]
+        verbose_name = "Mongo Sync Outbox Entry"
+        verbose_name_plural = "Mongo Sync Outbox"
+
+    def __str__(self):
+        return f"{self.machine_id} :: {self.license_key} (attempts: {self.attempts})"
+
+
+class MongoLicenseMirror(models.Model):
+    machine_id = models.CharField(max_length=64, unique=True)
+    license_key = models.CharField(max_length=64, db_index=True)
+    license_email = models.CharField(max_length=254, blank=True)
+    customer_name = models.CharField(max_length=120, blank=True)
+    contact_email = models.CharField(max_length=254, blank=True)
+    note = models.TextField(blank=True)
+    generated_by = models.CharField(max_length=120, blank=True)
+    status = models.CharField(max_length=32, default="generated")
+    source = models.CharField(max_length=64, blank=True)
+    generated_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    valid_until = models.DateTimeField(null=True, blank=True, db_index=True)
+    created_at = models.DateTimeField(null=True, blank=True)
+    mirrored_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-generated_at"]
+        verbose_name = "Mongo License Mirror"
+        verbose_name_plural = "Mongo License Mirror"
+
+    def __str__(self):
+        return f"{self.machine_id} :: {self.license_key}"
+
+
+class MongoMirrorState(models.Model):
+    target = models.CharField(max_length=64, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.target} @ {self.watermark}"
+
+
 class LicenseRuntimeConfig(models.Model):
+    # Bumped on every save/delete so this process reloads the row at once;
+    # other processes re-read it within LICENSE_RUNTIME_CONFIG_MAX_AGE_SECONDS.
+    _revisions = itertools.count(1)
+    local_revision = 0
+
     mongo_uri = models.TextField(blank=True)
     mongo_db = models.CharField(max_length=128, blank=True)
     mongo_collection = models.CharField(max_length=128, blank=True)
@@ -37,6 +110,10 @@ class LicenseRuntimeConfig(models.Model):
     def get_singleton(cls):
         return cls.objects.order_by("-id").first()
 
+    @classmethod
+    def bump_local_revision(cls):
+        LicenseRuntimeConfig.local_revision = next(cls._revisions)
+
     @classmethod
     def save_singleton(cls, *, mongo_uri, mongo_db, mongo_collection, updated_by):
         instance = cls.get_singleton()
@@ -57,5 +134,14 @@ class LicenseRuntimeConfig(models.Model):
         cls.objects.exclude(pk=instance.pk).delete()
         return instance
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.bump_local_revision()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.bump_local_revision()
+        return result
+
     def __str__(self):
         return f"{self.mongo_db}.{self.mongo_collection}"
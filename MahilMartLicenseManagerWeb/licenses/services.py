@@ -1,12 +1,43 @@
+import asyncio
+import base64
 import configparser
+import contextvars
+import csv
+import hashlib
+import heapq
+import importlib.util
+import io
+import json
+import hmac
+import logging
 import os
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, time as datetime_time, timedelta, timezone
 from pathlib import Path
 import re
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import BooleanField, Case, Count, Max, Min, Q, Value, When
+from django.utils import timezone as django_timezone
+from django.utils.dateparse import parse_datetime
 
-from .models import LicenseRuntimeConfig
+from .models import (
+    GeneratedLicense,
+    LicenseRuntimeConfig,
+    MongoLicenseMirror,
+    MongoMirrorState,
+    MongoSyncOutbox,
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 def normalize_machine_id(machine_id):
@@ -30,20 +61,36 @@ def is_browser_style_machine_id(machine_id):
     )
 
 
+def machine_id_error(machine_id):
+    if not is_machine_id_valid(machine_id):
+        return "Enter valid Machine ID (3-64 chars: letters, numbers, dot, underscore, hyphen)."
+    if is_browser_style_machine_id(machine_id):
+        return "POS browser UUID not allowed. Use installer machine ID (example: DESKTOP-XXXXXXX)."
+    return ""
+
+
+_LICENSE_KEY_MODULUS = 16777215
+_LICENSE_KEY_CHARSETS = (
+    "ABCDEFGHJKLMNPQRSTUVWXYZ",
+    "abcdefghijkmnopqrstuvwxyz",
+    "23456789",
+)
+_LICENSE_KEY_SPECIAL_CHARS = "@#$%&*!?"
+_LICENSE_KEY_BATCH_CHUNK_SIZE = 4096
+_LICENSE_KEY_VECTORIZE_THRESHOLD = 64
+
+
 def _build_checksum_value(seed, multiplier, offset):
     total = 0
-    modulus = 16777215
+    modulus = _LICENSE_KEY_MODULUS
     for index, char in enumerate(seed, start=1):
         total = (total + (ord(char) + offset) * (index + multiplier)) % modulus
     return total
 
 
 def _generate_modern_license_key(seed):
-    uppercase_chars = "ABCDEFGHJKLMNPQRSTUVWXYZ"
-    lowercase_chars = "abcdefghijkmnopqrstuvwxyz"
-    number_chars = "23456789"
-    special_chars = "@#$%&*!?"
-    modulus = 16777215
+    special_chars = _LICENSE_KEY_SPECIAL_CHARS
+    modulus = _LICENSE_KEY_MODULUS
 
     state = (
         _build_checksum_value(seed, 3, 11)
@@ -54,12 +101,7 @@ def _generate_modern_license_key(seed):
     base_chars = []
     for index in range(30):
         state = (state * 73 + 19 + index * 131) % modulus
-        if index % 3 == 0:
-            charset = uppercase_chars
-        elif index % 3 == 1:
-            charset = lowercase_chars
-        else:
-            charset = number_chars
+        charset = _LICENSE_KEY_CHARSETS[index % 3]
         base_chars.append(charset[state % len(charset)])
 
     base_key = "".join(base_chars)
@@ -70,6 +112,65 @@ def _generate_modern_license_key(seed):
     return f"{base_key[:10]}{special_a}{base_key[10:20]}{special_b}{base_key[20:]}"
 
 
+def _generate_modern_license_keys_numpy(numpy, seeds):
+    # Same arithmetic as _generate_modern_license_key, one column per step.
+    # The checksum is a modular sum, so it can be reduced once per row.
+    modulus = _LICENSE_KEY_MODULUS
+    lengths = numpy.fromiter((len(seed) for seed in seeds), dtype=numpy.int64, count=len(seeds))
+    width = max(int(lengths.max()), 1)
+    codes = (
+        numpy.array(seeds, dtype=f"<U{width}")
+        .view(numpy.uint32)
+        .reshape(len(seeds), width)
+        .astype(numpy.int64)
+    )
+    positions = numpy.arange(1, width + 1, dtype=numpy.int64)
+    mask = positions[None, :] <= lengths[:, None]
+
+    def checksum(multiplier, offset):
+        weighted = (codes + offset) * (positions + multiplier)
+        return numpy.where(mask, weighted, 0).sum(axis=1) % modulus
+
+    state = (checksum(3, 11) + checksum(7, 19) + lengths * 97) % modulus
+
+    charsets = [
+        numpy.array([ord(char) for char in charset], dtype=numpy.uint32)
+        for charset in _LICENSE_KEY_CHARSETS
+    ]
+    special_chars = numpy.array(
+        [ord(char) for char in _LICENSE_KEY_SPECIAL_CHARS], dtype=numpy.uint32
+    )
+    output = numpy.empty((len(seeds), 32), dtype=numpy.uint32)
+    for index in range(30):
+        state = (state * 73 + 19 + index * 131) % modulus
+        charset = charsets[index % 3]
+        column = index + (index >= 10) + (index >= 20)
+        output[:, column] = charset[state % len(charset)]
+
+    state = (state * 73 + 17) % modulus
+    output[:, 10] = special_chars[state % len(special_chars)]
+    state = (state * 73 + 29) % modulus
+    output[:, 21] = special_chars[state % len(special_chars)]
+    return output.view("<U32").ravel().tolist()
+
+
+def _generate_modern_license_keys(seeds):
+    seeds = list(seeds)
+    if len(seeds) < _LICENSE_KEY_VECTORIZE_THRESHOLD:
+        return [_generate_modern_license_key(seed) for seed in seeds]
+
+    try:
+        import numpy
+    except Exception:
+        return [_generate_modern_license_key(seed) for seed in seeds]
+
+    keys = []
+    for start in range(0, len(seeds), _LICENSE_KEY_BATCH_CHUNK_SIZE):
+        chunk = seeds[start : start + _LICENSE_KEY_BATCH_CHUNK_SIZE]
+        keys.extend(_generate_modern_license_keys_numpy(numpy, chunk))
+    return keys
+
+
 def _normalize_generation_time(generated_at=None):
     value = generated_at or datetime.now(timezone.utc)
     if value.tzinfo is None:
@@ -89,14 +190,295 @@ def _license_key_seed_mode():
     return (getattr(settings, "LICENSE_KEY_SEED_MODE", "windowed") or "windowed").strip().lower()
 
 
+def _license_key_seed_window(generated_at=None):
+    if _license_key_seed_mode() == "pos_static":
+        return None
+    return _license_key_window_start(generated_at)
+
+
+def _build_license_key_seed(machine, window_start):
+    if window_start is None:
+        return f"{settings.LICENSE_EMAIL.upper()}|{machine}"
+    return f"{settings.LICENSE_EMAIL.upper()}|{machine}|{window_start.strftime('%Y%m%d%H%M')}"
+
+
+def _int_setting(name, default, minimum=0):
+    raw_value = getattr(settings, name, default)
+    try:
+        value = int(raw_value)
+    except (TypeError, ValueError):
+        value = default
+    return max(minimum, value)
+
+
+# Bounded LRU of seed -> license key. Windowed entries expire with their window.
+class _LicenseKeyCache:
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_expiry = None
+        self.hits = 0
+        self.misses = 0
+
+    def _purge_expired(self, now):
+        if self._next_expiry is None or now < self._next_expiry:
+            return
+        self._next_expiry = None
+        for seed, (_key, expires_at) in list(self._entries.items()):
+            if expires_at is None:
+                continue
+            if expires_at <= now:
+                del self._entries[seed]
+            elif self._next_expiry is None or expires_at < self._next_expiry:
+                self._next_expiry = expires_at
+
+    def get(self, seed, now=None):
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            self._purge_expired(now)
+            entry = self._entries.get(seed)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(seed)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, seed, license_key, expires_at=None, now=None):
+        now = now or datetime.now(timezone.utc)
+        if expires_at is not None and expires_at <= now:
+            return
+        max_size = _int_setting("LICENSE_KEY_CACHE_SIZE", 4096)
+        if max_size <= 0:
+            return
+        with self._lock:
+            self._entries[seed] = (license_key, expires_at)
+            self._entries.move_to_end(seed)
+            if expires_at is not None and (self._next_expiry is None or expires_at < self._next_expiry):
+                self._next_expiry = expires_at
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._next_expiry = None
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": _int_setting("LICENSE_KEY_CACHE_SIZE", 4096),
+            }
+
+
+_license_key_cache = _LicenseKeyCache()
+
+
+def get_license_key_cache_stats():
+    return _license_key_cache.stats()
+
+
+def clear_license_key_cache():
+    _license_key_cache.clear()
+
+
+def get_license_key_verify_previous_windows():
+    return _int_setting("LICENSE_KEY_VERIFY_PREVIOUS_WINDOWS", 1)
+
+
+def _license_key_window_end(window_start):
+    if window_start is None:
+        return None
+    return window_start + timedelta(minutes=get_license_key_validity_minutes())
+
+
+def _license_key_cache_expiry(window_start):
+    # Keys stay verifiable for the configured number of later windows.
+    if window_start is None:
+        return None
+    window = timedelta(minutes=get_license_key_validity_minutes())
+    return window_start + window * (1 + get_license_key_verify_previous_windows())
+
+
+def _cached_license_key(seed, window_start):
+    license_key = _license_key_cache.get(seed)
+    if license_key is None:
+        license_key = _generate_modern_license_key(seed)
+        _license_key_cache.set(seed, license_key, _license_key_cache_expiry(window_start))
+    return license_key
+
+
 def generate_machine_license_key(machine_id, generated_at=None):
     machine = normalize_machine_id(machine_id)
+    window_start = _license_key_seed_window(generated_at)
+    return _cached_license_key(_build_license_key_seed(machine, window_start), window_start)
+
+
+def generate_machine_license_keys(machine_ids, generated_at=None):
+    window_start = _license_key_seed_window(generated_at)
+    expires_at = _license_key_cache_expiry(window_start)
+    seeds = [
+        _build_license_key_seed(normalize_machine_id(machine_id), window_start)
+        for machine_id in machine_ids
+    ]
+
+    keys = [_license_key_cache.get(seed) for seed in seeds]
+    missing_seeds = list(dict.fromkeys(seed for seed, key in zip(seeds, keys) if key is None))
+    if missing_seeds:
+        generated = dict(zip(missing_seeds, _generate_modern_license_keys(missing_seeds)))
+        for seed, license_key in generated.items():
+            _license_key_cache.set(seed, license_key, expires_at)
+        keys = [key if key is not None else generated[seed] for seed, key in zip(seeds, keys)]
+    return keys
+
+
+def _next_license_key_window_start(now=None):
+    window = timedelta(minutes=get_license_key_validity_minutes())
+    return _license_key_window_start(now) + window
+
+
+def prewarm_next_window_license_keys(machine_ids=None, now=None):
     if _license_key_seed_mode() == "pos_static":
-        seed = f"{settings.LICENSE_EMAIL.upper()}|{machine}"
+        return 0
+
+    # Next-window keys share the LRU with the keys still in use this window,
+    # so prewarm fills at most half of it (most recently active machines first).
+    limit = _int_setting("LICENSE_KEY_CACHE_SIZE", 4096) // 2
+    next_window_start = _next_license_key_window_start(now)
+    if machine_ids is None:
+        machine_ids = GeneratedLicense.objects.order_by("-updated_at").values_list("machine_id", flat=True)[:limit]
+    machine_ids = [machine_id for machine_id in machine_ids if machine_id][:limit]
+    if not machine_ids:
+        return 0
+
+    chunk_size = _LICENSE_KEY_BATCH_CHUNK_SIZE
+    chunks = [
+        machine_ids[start : start + chunk_size]
+        for start in range(0, len(machine_ids), chunk_size)
+    ]
+    workers = _int_setting("LICENSE_KEY_PREWARM_WORKERS", 2, minimum=1)
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        list(
+            executor.map(
+                lambda chunk: generate_machine_license_keys(chunk, generated_at=next_window_start),
+                chunks,
+            )
+        )
+    return len(machine_ids)
+
+
+def _seconds_until_license_key_prewarm(now=None):
+    now = _normalize_generation_time(now)
+    lead = timedelta(minutes=_int_setting("LICENSE_KEY_PREWARM_LEAD_MINUTES", 2))
+    window = timedelta(minutes=get_license_key_validity_minutes())
+    run_at = _next_license_key_window_start(now) - lead
+    # A lead longer than the window would otherwise leave run_at in the past.
+    while run_at <= now:
+        run_at += window
+    return (run_at - now).total_seconds()
+
+
+class LicenseKeyPrewarmScheduler(threading.Thread):
+    def __init__(self):
+        super().__init__(name="license-key-prewarm", daemon=True)
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(_seconds_until_license_key_prewarm()):
+            try:
+                count = prewarm_next_window_license_keys()
+                logger.info("Pre-generated next-window license keys for %s machines.", count)
+            except Exception:
+                logger.exception("License key pre-generation failed.")
+            finally:
+                close_old_connections()
+
+    def stop(self):
+        self.stop_event.set()
+
+
+_prewarm_scheduler = None
+_prewarm_scheduler_lock = threading.Lock()
+
+
+def start_license_key_prewarm_scheduler():
+    global _prewarm_scheduler
+    if not getattr(settings, "LICENSE_KEY_PREWARM_ENABLED", True):
+        return None
+    if _license_key_seed_mode() == "pos_static":
+        return None
+
+    with _prewarm_scheduler_lock:
+        if _prewarm_scheduler is None or not _prewarm_scheduler.is_alive():
+            _prewarm_scheduler = LicenseKeyPrewarmScheduler()
+            _prewarm_scheduler.start()
+        return _prewarm_scheduler
+
+
+def verify_machine_license_key(machine_id, license_key, checked_at=None):
+    machine = normalize_machine_id(machine_id)
+    candidate = (license_key or "").strip()
+    window_start = _license_key_seed_window(checked_at)
+
+    if window_start is None:
+        windows = [None]
     else:
-        window_start = _license_key_window_start(generated_at)
-        seed = f"{settings.LICENSE_EMAIL.upper()}|{machine}|{window_start.strftime('%Y%m%d%H%M')}"
-    return _generate_modern_license_key(seed)
+        window = timedelta(minutes=get_license_key_validity_minutes())
+        windows = [
+            window_start - window * index
+            for index in range(get_license_key_verify_previous_windows() + 1)
+        ]
+
+    for candidate_window in windows:
+        seed = _build_license_key_seed(machine, candidate_window)
+        expected = _license_key_cache.get(seed)
+        cached = expected is not None
+        if not cached:
+            # Failed checks (unknown machines, guesses) must not push real keys
+            # out of the shared cache, so only a match is remembered.
+            expected = _generate_modern_license_key(seed)
+        if candidate and hmac.compare_digest(expected, candidate):
+            if not cached:
+                _license_key_cache.set(seed, expected, _license_key_cache_expiry(candidate_window))
+            return {
+                "valid": True,
+                "machine_id": machine,
+                "window_start": candidate_window,
+                "valid_until": _license_key_cache_expiry(candidate_window),
+            }
+
+    return {
+        "valid": False,
+        "machine_id": machine,
+        "window_start": None,
+        "valid_until": None,
+    }
+
+
+def get_api_token_client(token):
+    candidate = (token or "").strip().encode("utf-8")
+    if not candidate:
+        return ""
+
+    # Entries are "client:token" (or a bare token); every entry is compared
+    # in constant time so the response time does not leak a match.
+    client = ""
+    for entry in getattr(settings, "LICENSE_API_TOKENS", ()):
+        name, separator, secret = entry.partition(":")
+        if not separator:
+            name, secret = "", entry
+        if hmac.compare_digest(secret.strip().encode("utf-8"), candidate):
+            client = name.strip() or "api"
+    return client
+
+
+def get_api_batch_max():
+    return _int_setting("LICENSE_API_BATCH_MAX", 500, minimum=1)
 
 
 def get_license_key_validity_minutes():
@@ -157,27 +539,105 @@ def save_shared_mongo_config(*, mongo_uri, mongo_db, mongo_collection):
         config_path.parent.mkdir(parents=True, exist_ok=True)
         with config_path.open("w", encoding="utf-8") as file_obj:
             parser.write(file_obj)
+        invalidate_runtime_mongo_config()
         return True, f"POS shared Mongo config updated: {config_path}"
     except Exception as exc:
         return False, f"Could not update POS shared Mongo config: {exc}"
 
 
+class _RuntimeMongoConfigCache:
+    # Keeps the parsed shared INI (re-read when its mtime/size changes) and the
+    # LicenseRuntimeConfig row (re-read when it is older than the max age or
+    # this process saved a new one).
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.shared_signature = None
+        self.shared_config = {}
+        self.shared_checked_at = None
+        self.row_loaded = False
+        self.row_version = None
+        self.row_loaded_at = None
+        self.row_config = None
+
+
+_runtime_config_cache = _RuntimeMongoConfigCache()
+
+
+def invalidate_runtime_mongo_config():
+    with _runtime_config_cache.lock:
+        _runtime_config_cache.reset()
+
+
+def _shared_mongo_config_signature(config_path):
+    try:
+        stat_result = config_path.stat()
+    except OSError:
+        return (str(config_path), None, None)
+    return (str(config_path), stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _cached_shared_mongo_config(now):
+    state = _runtime_config_cache
+    check_seconds = _int_setting("LICENSE_SHARED_CONFIG_CHECK_SECONDS", 2)
+    if state.shared_checked_at is not None and now - state.shared_checked_at < check_seconds:
+        return state.shared_config
+
+    signature = _shared_mongo_config_signature(_shared_mongo_config_path())
+    if signature != state.shared_signature:
+        state.shared_config = read_shared_mongo_config() if signature[1] is not None else {}
+        state.shared_signature = signature
+    state.shared_checked_at = now
+    return state.shared_config
+
+
+def _cached_runtime_config_row(now):
+    state = _runtime_config_cache
+    version = LicenseRuntimeConfig.local_revision
+    max_age = _int_setting("LICENSE_RUNTIME_CONFIG_MAX_AGE_SECONDS", 2)
+    if (
+        state.row_loaded
+        and state.row_version == version
+        and now - state.row_loaded_at < max_age
+    ):
+        return state.row_config
+
+    try:
+        runtime_config = LicenseRuntimeConfig.get_singleton()
+    except Exception:
+        return None
+
+    state.row_config = None
+    if runtime_config is not None:
+        state.row_config = {
+            "mongo_uri": runtime_config.mongo_uri,
+            "mongo_db": runtime_config.mongo_db,
+            "mongo_collection": runtime_config.mongo_collection,
+        }
+    state.row_loaded = True
+    state.row_version = version
+    state.row_loaded_at = now
+    return state.row_config
+
+
 def get_runtime_mongo_config():
     mongo_uri = (settings.LICENSE_MONGO_URI or "").strip()
     mongo_db = (settings.LICENSE_MONGO_DB or "").strip()
     mongo_collection = (settings.LICENSE_MONGO_COLLECTION or "").strip()
-    shared_config = read_shared_mongo_config()
+
+    now = time.monotonic()
+    with _runtime_config_cache.lock:
+        shared_config = _cached_shared_mongo_config(now)
+        runtime_config = _cached_runtime_config_row(now)
 
     if shared_config:
         mongo_uri = shared_config.get("mongo_uri") or mongo_uri
         mongo_db = shared_config.get("mongo_db") or mongo_db
         mongo_collection = shared_config.get("mongo_collection") or mongo_collection
 
-    try:
-        runtime_config = LicenseRuntimeConfig.get_singleton()
-    except Exception:
-        runtime_config = None
-
     if runtime_config is None:
         return {
             "mongo_uri": mongo_uri,
@@ -186,24 +646,250 @@ def get_runtime_mongo_config():
         }
 
     return {
-        "mongo_uri": (runtime_config.mongo_uri or mongo_uri).strip(),
-        "mongo_db": (runtime_config.mongo_db or mongo_db).strip(),
-        "mongo_collection": (runtime_config.mongo_collection or mongo_collection).strip(),
+        "mongo_uri": (runtime_config["mongo_uri"] or mongo_uri).strip(),
+        "mongo_db": (runtime_config["mongo_db"] or mongo_db).strip(),
+        "mongo_collection": (runtime_config["mongo_collection"] or mongo_collection).strip(),
     }
 
 
-def sync_to_mongo(payload):
-    runtime_mongo = get_runtime_mongo_config()
-    mongo_uri = runtime_mongo["mongo_uri"]
-    if not mongo_uri:
-        return False, "Mongo URI empty. Saved only in local Django database."
+class MongoCircuitBreaker:
+    # Opens after consecutive Mongo failures so callers fail fast. Once the
+    # reset timeout passes, the next caller starts a background ping (half
+    # open) and the breaker closes again when it succeeds.
 
-    try:
-        from pymongo import MongoClient
-    except Exception:
-        return False, "pymongo package not installed. Saved only in local Django database."
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = ""
 
-    now_utc = datetime.now(timezone.utc)
+    def allow_request(self, now=None):
+        now = now if now is not None else time.monotonic()
+        reset_seconds = _int_setting("LICENSE_MONGO_BREAKER_RESET_SECONDS", 30, minimum=1)
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and now - self.opened_at >= reset_seconds:
+                self.state = "half_open"
+                threading.Thread(target=self._probe, name="license-mongo-probe", daemon=True).start()
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.opened_at = None
+            self.last_error = ""
+
+    def record_failure(self, error, now=None):
+        threshold = _int_setting("LICENSE_MONGO_BREAKER_FAILURE_THRESHOLD", 3, minimum=1)
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            if self.state == "half_open" or self.failures >= threshold:
+                self.state = "open"
+                self.opened_at = now if now is not None else time.monotonic()
+
+    def _probe(self):
+        try:
+            runtime_mongo = get_runtime_mongo_config()
+            get_mongo_client(runtime_mongo["mongo_uri"]).admin.command("ping")
+        except Exception as exc:
+            self.record_failure(exc)
+        else:
+            self.record_success()
+        finally:
+            close_old_connections()
+
+    def reset(self):
+        self.record_success()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "last_error": self.last_error,
+            }
+
+
+_mongo_breaker = MongoCircuitBreaker()
+
+
+def get_mongo_circuit_state():
+    return _mongo_breaker.snapshot()
+
+
+def _mongo_circuit_open_message():
+    return "MongoDB unavailable (circuit open). Saved only in local Django database."
+
+
+_mongo_clients = {}
+_mongo_clients_lock = threading.Lock()
+_mongo_clients_pid = os.getpid()
+
+
+def _reset_mongo_clients_after_fork():
+    global _mongo_clients_lock, _mongo_clients_pid, _mongo_writer, _mongo_breaker
+    global _mongo_loop, _mongo_loop_lock
+    # Sockets and writer threads inherited from the parent must not be reused
+    # or closed here.
+    _mongo_clients.clear()
+    _mongo_clients_lock = threading.Lock()
+    _mongo_clients_pid = os.getpid()
+    _mongo_writer = MongoCoalescingWriter()
+    _mongo_breaker = MongoCircuitBreaker()
+    # The Mongo loop thread does not exist in the child.
+    _async_mongo_clients.clear()
+    _mongo_loop = None
+    _mongo_loop_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_mongo_clients_after_fork)
+
+
+def get_mongo_client(mongo_uri):
+    from pymongo import MongoClient
+
+    if _mongo_clients_pid != os.getpid():
+        _reset_mongo_clients_after_fork()
+
+    with _mongo_clients_lock:
+        client = _mongo_clients.get(mongo_uri)
+        if client is not None:
+            return client
+
+        stale_clients = list(_mongo_clients.values())
+        _mongo_clients.clear()
+        for stale_client in stale_clients:
+            try:
+                stale_client.close()
+            except Exception:
+                pass
+        if stale_clients:
+            _mongo_breaker.reset()
+
+        client = MongoClient(
+            mongo_uri,
+            serverSelectionTimeoutMS=5000,
+            maxPoolSize=_int_setting("LICENSE_MONGO_MAX_POOL_SIZE", 20, minimum=1),
+            connect=False,
+        )
+        _mongo_clients[mongo_uri] = client
+        return client
+
+
+# Async reads run on one long-lived loop that owns the async clients. Under
+# runserver every request gets its own loop, closed (and its tasks
+# cancelled) when the response is done; a read on the Mongo loop outlives
+# that, so a late answer still fills the cache for the next request.
+_async_mongo_clients = {}
+_mongo_loop = None
+_mongo_loop_lock = threading.Lock()
+
+
+def _get_mongo_loop():
+    global _mongo_loop
+    with _mongo_loop_lock:
+        if _mongo_loop is None or _mongo_loop.is_closed():
+            _mongo_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_mongo_loop.run_forever, name="license-mongo-loop", daemon=True
+            ).start()
+        return _mongo_loop
+
+
+def run_on_mongo_loop(coro):
+    # Cancelling the returned future (or closing the caller's loop) leaves the
+    # coroutine running on the Mongo loop. It starts in an empty context so it
+    # does not inherit asgiref's per-request executor, which is gone once the
+    # request finishes.
+    caller_loop = asyncio.get_running_loop()
+    result = caller_loop.create_future()
+
+    def _set_result(mongo_future):
+        if result.done():
+            return
+        if mongo_future.cancelled():
+            result.cancel()
+        elif mongo_future.exception() is not None:
+            result.set_exception(mongo_future.exception())
+        else:
+            result.set_result(mongo_future.result())
+
+    def _relay(mongo_future):
+        try:
+            caller_loop.call_soon_threadsafe(_set_result, mongo_future)
+        except RuntimeError:
+            pass
+
+    mongo_future = contextvars.Context().run(
+        asyncio.run_coroutine_threadsafe, coro, _get_mongo_loop()
+    )
+    mongo_future.add_done_callback(_relay)
+    return result
+
+
+def get_async_mongo_client(mongo_uri):
+    from pymongo import AsyncMongoClient
+
+    # Only called on the Mongo loop, so no lock is needed.
+    client = _async_mongo_clients.get(mongo_uri)
+    if client is None:
+        _close_async_mongo_clients()
+        client = AsyncMongoClient(
+            mongo_uri,
+            serverSelectionTimeoutMS=5000,
+            maxPoolSize=_int_setting("LICENSE_MONGO_MAX_POOL_SIZE", 20, minimum=1),
+            connect=False,
+        )
+        _async_mongo_clients[mongo_uri] = client
+    return client
+
+
+def _close_async_mongo_clients():
+    clients = list(_async_mongo_clients.values())
+    _async_mongo_clients.clear()
+    loop = _mongo_loop
+    if not clients or loop is None or loop.is_closed():
+        return
+
+    async def _close():
+        for client in clients:
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+    asyncio.run_coroutine_threadsafe(_close(), loop)
+
+
+def close_mongo_clients():
+    with _mongo_clients_lock:
+        clients = list(_mongo_clients.values())
+        _mongo_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+    _close_async_mongo_clients()
+    _mongo_breaker.reset()
+
+
+def _get_mongo_collection(runtime_mongo):
+    client = get_mongo_client(runtime_mongo["mongo_uri"])
+    return client[runtime_mongo["mongo_db"]][runtime_mongo["mongo_collection"]]
+
+
+def _aget_mongo_collection(runtime_mongo):
+    client = get_async_mongo_client(runtime_mongo["mongo_uri"])
+    return client[runtime_mongo["mongo_db"]][runtime_mongo["mongo_collection"]]
+
+
+def _build_mongo_license_document(payload, now_utc):
     generated_at = payload.get("generated_at") or now_utc
     if generated_at.tzinfo is None:
         generated_at = generated_at.replace(tzinfo=timezone.utc)
@@ -212,7 +898,7 @@ def sync_to_mongo(payload):
     if valid_until.tzinfo is None:
         valid_until = valid_until.replace(tzinfo=timezone.utc)
 
-    document = {
+    return {
         "license_key": payload["license_key"],
         "machine_id": payload["machine_id"],
         "license_email": settings.LICENSE_EMAIL,
@@ -226,87 +912,1412 @@ def sync_to_mongo(payload):
         "source": payload.get("source", getattr(settings, "LICENSE_SOURCE", "license_manager_page")),
     }
 
-    client = None
-    try:
-        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-        client.admin.command("ping")
-        collection = client[runtime_mongo["mongo_db"]][runtime_mongo["mongo_collection"]]
-        collection.update_one(
-            {"machine_id": document["machine_id"]},
-            {
-                "$set": document,
-                "$setOnInsert": {
-                    "created_at": now_utc,
-                },
-            },
-            upsert=True,
-        )
-        collection.delete_many(
-            {
-                "machine_id": document["machine_id"],
-                "license_key": {"$ne": document["license_key"]},
-            }
-        )
-        return True, "Saved to MongoDB."
-    except Exception as exc:
-        return False, f"Mongo sync failed: {exc}"
-    finally:
-        if client is not None:
-            client.close()
 
+class MongoCoalescingWriter:
+    # Gathers license upserts for a short window and writes them as a single
+    # unordered bulk_write. Callers wait on a Future for their own result.
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._pending = []
+        self._thread = None
+
+    def submit(self, runtime_mongo, document, created_at):
+        future = Future()
+        with self._condition:
+            self._pending.append((runtime_mongo, document, created_at, future))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="license-mongo-writer", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def _next_batch(self):
+        window_seconds = _int_setting("LICENSE_MONGO_WRITE_WINDOW_MS", 50) / 1000
+        batch_size = _int_setting("LICENSE_MONGO_WRITE_BATCH_SIZE", 100, minimum=1)
+        with self._condition:
+            while not self._pending:
+                self._condition.wait()
+            deadline = time.monotonic() + window_seconds
+            while len(self._pending) < batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            batch = self._pending[:batch_size]
+            del self._pending[:batch_size]
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._flush(batch)
+            except Exception as exc:
+                for *_item, future in batch:
+                    if not future.done():
+                        future.set_result((False, f"Mongo sync failed: {exc}"))
+
+    def _flush(self, batch):
+        groups = {}
+        for item in batch:
+            runtime_mongo = item[0]
+            group_key = (
+                runtime_mongo["mongo_uri"],
+                runtime_mongo["mongo_db"],
+                runtime_mongo["mongo_collection"],
+            )
+            groups.setdefault(group_key, []).append(item)
+
+        for items in groups.values():
+            self._flush_group(items)
+
+    def _flush_group(self, items):
+        from pymongo import DeleteMany, UpdateOne
+        from pymongo.errors import BulkWriteError
+
+        # Only the newest document per machine is written; superseded
+        # submissions share its result.
+        latest = {}
+        for runtime_mongo, document, created_at, future in items:
+            latest[document["machine_id"]] = (document, created_at)
+
+        machine_ids = list(latest)
+        operations = []
+        for machine_id in machine_ids:
+            document, created_at = latest[machine_id]
+            operations.append(
+                UpdateOne(
+                    {"machine_id": machine_id},
+                    {"$set": document, "$setOnInsert": {"created_at": created_at}},
+                    upsert=True,
+                )
+            )
+            operations.append(
+                DeleteMany(
+                    {"machine_id": machine_id, "license_key": {"$ne": document["license_key"]}}
+                )
+            )
+
+        failures = {}
+        try:
+            _get_mongo_collection(items[0][0]).bulk_write(operations, ordered=False)
+        except BulkWriteError as exc:
+            _mongo_breaker.record_success()
+            for error in exc.details.get("writeErrors", []):
+                machine_id = machine_ids[error["index"] // 2]
+                failures.setdefault(machine_id, f"Mongo sync failed: {error.get('errmsg', '')}")
+        except Exception as exc:
+            _mongo_breaker.record_failure(exc)
+            failures = {machine_id: f"Mongo sync failed: {exc}" for machine_id in machine_ids}
+        else:
+            _mongo_breaker.record_success()
+
+        for _runtime_mongo, document, _created_at, future in items:
+            message = failures.get(document["machine_id"])
+            future.set_result((False, message) if message else (True, "Saved to MongoDB."))
 
-def fetch_recent_mongo_licenses(limit=100):
+
+_mongo_writer = MongoCoalescingWriter()
+
+
+def sync_many_to_mongo(payloads):
+    payloads = list(payloads)
     runtime_mongo = get_runtime_mongo_config()
     mongo_uri = runtime_mongo["mongo_uri"]
     if not mongo_uri:
+        return [(False, "Mongo URI empty. Saved only in local Django database.")] * len(payloads)
+
+    if importlib.util.find_spec("pymongo") is None:
+        return [
+            (False, "pymongo package not installed. Saved only in local Django database.")
+        ] * len(payloads)
+
+    if not _mongo_breaker.allow_request():
+        return [(False, _mongo_circuit_open_message())] * len(payloads)
+
+    now_utc = datetime.now(timezone.utc)
+    futures = [
+        _mongo_writer.submit(runtime_mongo, _build_mongo_license_document(payload, now_utc), now_utc)
+        for payload in payloads
+    ]
+
+    timeout_seconds = _int_setting("LICENSE_MONGO_WRITE_TIMEOUT_SECONDS", 30, minimum=1)
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result(timeout=timeout_seconds))
+        except FutureTimeoutError:
+            results.append((False, "Mongo sync failed: timed out waiting for MongoDB write."))
+
+    if any(ok for ok, _message in results):
+        invalidate_recent_mongo_licenses_cache()
+    return results
+
+
+def sync_to_mongo(payload):
+    return sync_many_to_mongo([payload])[0]
+
+
+_MONGO_RECENT_GENERATION_KEY = "licenses:mongo_recent:generation"
+
+
+def _mongo_target_hash(runtime_mongo):
+    target = "|".join(
+        (runtime_mongo["mongo_uri"], runtime_mongo["mongo_db"], runtime_mongo["mongo_collection"])
+    )
+    return hashlib.sha256(target.encode("utf-8")).hexdigest()[:16]
+
+
+def _mongo_recent_cache_key(runtime_mongo, limit, generation):
+    return f"licenses:mongo_recent:{generation or 0}:{_mongo_target_hash(runtime_mongo)}:{limit}"
+
+
+def invalidate_recent_mongo_licenses_cache():
+    try:
+        cache.incr(_MONGO_RECENT_GENERATION_KEY)
+    except ValueError:
+        cache.set(_MONGO_RECENT_GENERATION_KEY, 1, None)
+
+
+_LICENSE_RECORD_FIELDS = (
+    "license_key",
+    "machine_id",
+    "customer_name",
+    "contact_email",
+    "note",
+    "generated_by",
+    "generated_at",
+    "valid_until",
+    "status",
+    "source",
+)
+_LICENSE_RECORD_COLUMNS = _LICENSE_RECORD_FIELDS + ("is_valid", "id")
+_LICENSE_RECORD_PROJECTION = dict.fromkeys(_LICENSE_RECORD_FIELDS, 1) | {"_id": 0}
+
+
+class LicenseRecord:
+    __slots__ = _LICENSE_RECORD_COLUMNS
+
+    def __init__(
+        self,
+        license_key="",
+        machine_id="",
+        customer_name="",
+        contact_email="",
+        note="",
+        generated_by="",
+        generated_at=None,
+        valid_until=None,
+        status="generated",
+        source="",
+        is_valid=None,
+        id=None,
+    ):
+        self.license_key = license_key
+        self.machine_id = machine_id
+        self.customer_name = customer_name
+        self.contact_email = contact_email
+        self.note = note
+        self.generated_by = generated_by
+        self.generated_at = generated_at
+        self.valid_until = valid_until
+        self.status = status
+        self.source = source
+        self.is_valid = is_valid
+        self.id = id
+
+    @classmethod
+    def from_row(cls, row):
+        # Rows come from values_list(*_LICENSE_RECORD_FIELDS[, "is_valid"[, "id"]]).
+        return cls(*row)
+
+    @classmethod
+    def from_document(cls, document):
+        generated_at = document.get("generated_at")
+        valid_until = document.get("valid_until")
+        if generated_at is not None and generated_at.tzinfo is None:
+            generated_at = generated_at.replace(tzinfo=timezone.utc)
+        if valid_until is not None and valid_until.tzinfo is None:
+            valid_until = valid_until.replace(tzinfo=timezone.utc)
+        return cls(
+            license_key=document.get("license_key") or "",
+            machine_id=document.get("machine_id") or "",
+            customer_name=document.get("customer_name") or "",
+            contact_email=document.get("contact_email") or "",
+            note=document.get("note") or "",
+            generated_by=document.get("generated_by") or "",
+            generated_at=generated_at,
+            valid_until=valid_until,
+            status=document.get("status") or "generated",
+            source=document.get("source") or getattr(settings, "LICENSE_SOURCE", "license_manager_page"),
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, LicenseRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"<LicenseRecord {self.machine_id} :: {self.license_key}>"
+
+
+def license_records(queryset):
+    # The queryset must carry the is_valid annotation (see annotate_license_validity).
+    return [LicenseRecord.from_row(row) for row in queryset.values_list(*_LICENSE_RECORD_COLUMNS)]
+
+
+async def alicense_records(queryset):
+    return [
+        LicenseRecord.from_row(row) async for row in queryset.values_list(*_LICENSE_RECORD_COLUMNS)
+    ]
+
+
+def _normalize_mongo_license_document(item):
+    generated_at = item.get("generated_at")
+    valid_until = item.get("valid_until")
+    created_at = item.get("created_at")
+    if generated_at is not None and generated_at.tzinfo is None:
+        generated_at = generated_at.replace(tzinfo=timezone.utc)
+    if valid_until is None and generated_at is not None:
+        valid_until = calculate_license_valid_until(generated_at)
+    if valid_until is not None and valid_until.tzinfo is None:
+        valid_until = valid_until.replace(tzinfo=timezone.utc)
+    if created_at is not None and created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+
+    return {
+        "license_key": item.get("license_key", ""),
+        "machine_id": item.get("machine_id", ""),
+        "license_email": item.get("license_email", settings.LICENSE_EMAIL),
+        "customer_name": item.get("customer_name", ""),
+        "contact_email": item.get("contact_email", ""),
+        "note": item.get("note", ""),
+        "generated_by": item.get("generated_by", ""),
+        "generated_at": generated_at,
+        "valid_until": valid_until,
+        "created_at": created_at,
+        "status": item.get("status", "generated"),
+        "source": item.get("source", getattr(settings, "LICENSE_SOURCE", "license_manager_page")),
+    }
+
+
+async def afetch_recent_mongo_licenses(limit=100):
+    runtime_mongo = await sync_to_async(get_runtime_mongo_config)()
+    if not runtime_mongo["mongo_uri"]:
         return []
+    return await run_on_mongo_loop(_afetch_recent_mongo_licenses(runtime_mongo, max(limit, 1)))
+
 
+async def _afetch_recent_mongo_licenses(runtime_mongo, limit):
     try:
-        from pymongo import DESCENDING, MongoClient
+        from pymongo import DESCENDING
     except Exception:
         return []
 
-    client = None
+    cache_key = _mongo_recent_cache_key(
+        runtime_mongo, limit, await cache.aget(_MONGO_RECENT_GENERATION_KEY)
+    )
+    cached_documents = await cache.aget(cache_key)
+    if cached_documents is not None:
+        return cached_documents
+
+    if not _mongo_breaker.allow_request():
+        return []
+
     try:
-        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-        client.admin.command("ping")
-        collection = client[runtime_mongo["mongo_db"]][runtime_mongo["mongo_collection"]]
-        cursor = collection.find({}, {"_id": 0}).sort("generated_at", DESCENDING).limit(max(limit, 1))
+        collection = _aget_mongo_collection(runtime_mongo)
+        cursor = (
+            collection.find({}, _LICENSE_RECORD_PROJECTION)
+            .sort("generated_at", DESCENDING)
+            .limit(limit)
+        )
+        documents = [LicenseRecord.from_document(item) async for item in cursor]
+    except Exception as exc:
+        _mongo_breaker.record_failure(exc)
+        return []
+
+    _mongo_breaker.record_success()
+    await cache.aset(
+        cache_key,
+        documents,
+        _int_setting("LICENSE_MONGO_RECENT_CACHE_SECONDS", 15),
+    )
+    return documents
+
+
+def get_mongo_fetch_deadline_seconds():
+    return _int_setting("LICENSE_MONGO_FETCH_DEADLINE_MS", 800) / 1000
+
+
+_MIRROR_FIELDS = (
+    "license_key",
+    "machine_id",
+    "license_email",
+    "customer_name",
+    "contact_email",
+    "note",
+    "generated_by",
+    "generated_at",
+    "valid_until",
+    "created_at",
+    "status",
+    "source",
+)
+
+
+def _mirror_row(document):
+    values = {}
+    for field_name in _MIRROR_FIELDS:
+        value = document.get(field_name)
+        field = MongoLicenseMirror._meta.get_field(field_name)
+        if isinstance(value, str) and field.max_length:
+            value = value[: field.max_length]
+        elif value is None and not field.null:
+            value = ""
+        values[field_name] = value
+    return MongoLicenseMirror(**values)
+
+
+def _upsert_mirror_rows(rows):
+    # One row per machine, like the Mongo collection; keep the newest.
+    latest = {row.machine_id: row for row in rows if row.machine_id}
+    MongoLicenseMirror.objects.bulk_create(
+        latest.values(),
+        update_conflicts=True,
+        unique_fields=["machine_id"],
+        update_fields=[
+            field_name
+            for field_name in _MIRROR_FIELDS
+            if field_name != "machine_id"
+        ]
+        + ["mirrored_at"],
+    )
+    return len(latest)
 
-        documents = []
+
+def sync_mongo_license_mirror(batch_size=500):
+    runtime_mongo = get_runtime_mongo_config()
+    if not runtime_mongo["mongo_uri"]:
+        return 0
+
+    try:
+        from pymongo import ASCENDING
+        from pymongo.errors import PyMongoError
+    except Exception:
+        return 0
+
+    if not _mongo_breaker.allow_request():
+        return 0
+
+    batch_size = max(1, int(batch_size))
+    target = _mongo_target_hash(runtime_mongo)
+    state = MongoMirrorState.objects.filter(target=target).first()
+    if state is None:
+        # New Mongo target: rebuild the mirror from scratch.
+        with transaction.atomic():
+            MongoLicenseMirror.objects.all().delete()
+            MongoMirrorState.objects.all().delete()
+            state = MongoMirrorState.objects.create(target=target)
+
+    query = {}
+    if state.watermark is not None:
+        query = {
+            "$or": [
+                {"generated_at": {"$gte": state.watermark}},
+                {"created_at": {"$gte": state.watermark}},
+            ]
+        }
+    projection = {"_id": 0}
+    projection.update({field_name: 1 for field_name in _MIRROR_FIELDS})
+
+    watermark = state.watermark
+    mirrored = 0
+    try:
+        collection = _get_mongo_collection(runtime_mongo)
+        cursor = (
+            collection.find(query, projection)
+            .sort("generated_at", ASCENDING)
+            .batch_size(batch_size)
+        )
+        chunk = []
         for item in cursor:
-            generated_at = item.get("generated_at")
-            valid_until = item.get("valid_until")
-            created_at = item.get("created_at")
-            if generated_at is not None and generated_at.tzinfo is None:
-                generated_at = generated_at.replace(tzinfo=timezone.utc)
-            if valid_until is None and generated_at is not None:
-                valid_until = calculate_license_valid_until(generated_at)
-            if valid_until is not None and valid_until.tzinfo is None:
-                valid_until = valid_until.replace(tzinfo=timezone.utc)
-            if created_at is not None and created_at.tzinfo is None:
-                created_at = created_at.replace(tzinfo=timezone.utc)
-
-            documents.append(
+            document = _normalize_mongo_license_document(item)
+            for field_name in ("generated_at", "created_at"):
+                value = document[field_name]
+                if value is not None and (watermark is None or value > watermark):
+                    watermark = value
+            chunk.append(_mirror_row(document))
+            if len(chunk) >= batch_size:
+                mirrored += _upsert_mirror_rows(chunk)
+                chunk = []
+        if chunk:
+            mirrored += _upsert_mirror_rows(chunk)
+    except PyMongoError as exc:
+        _mongo_breaker.record_failure(exc)
+        raise
+
+    _mongo_breaker.record_success()
+    MongoMirrorState.objects.filter(pk=state.pk).update(
+        watermark=watermark,
+        last_synced_at=datetime.now(timezone.utc),
+    )
+    return mirrored
+
+
+def is_mongo_mirror_enabled():
+    return bool(getattr(settings, "LICENSE_MONGO_MIRROR_ENABLED", False))
+
+
+async def afetch_mirrored_mongo_licenses(limit=100):
+    queryset = annotate_license_validity(MongoLicenseMirror.objects.order_by("-generated_at"))
+    return [
+        LicenseRecord.from_row(row)
+        async for row in queryset.values_list(*_LICENSE_RECORD_FIELDS, "is_valid")[: max(limit, 1)]
+    ]
+
+
+class MongoMirrorWorker(threading.Thread):
+    def __init__(self):
+        super().__init__(name="license-mongo-mirror", daemon=True)
+        self.stop_event = threading.Event()
+
+    def run(self):
+        interval_seconds = _int_setting("LICENSE_MONGO_MIRROR_INTERVAL_SECONDS", 30, minimum=1)
+        while not self.stop_event.is_set():
+            try:
+                sync_mongo_license_mirror()
+            except Exception:
+                logger.exception("Mongo mirror sync failed.")
+            finally:
+                close_old_connections()
+            self.stop_event.wait(interval_seconds)
+
+    def stop(self):
+        self.stop_event.set()
+
+
+_mirror_worker = None
+_mirror_worker_lock = threading.Lock()
+
+
+def start_mongo_mirror_worker():
+    global _mirror_worker
+    if not is_mongo_mirror_enabled():
+        return None
+
+    with _mirror_worker_lock:
+        if _mirror_worker is None or not _mirror_worker.is_alive():
+            _mirror_worker = MongoMirrorWorker()
+            _mirror_worker.start()
+        return _mirror_worker
+
+
+def _mongo_outbox_backoff(attempts):
+    base_seconds = _int_setting("LICENSE_MONGO_OUTBOX_BACKOFF_SECONDS", 5, minimum=1)
+    max_seconds = _int_setting("LICENSE_MONGO_OUTBOX_MAX_BACKOFF_SECONDS", 900, minimum=1)
+    return timedelta(seconds=min(max_seconds, base_seconds * 2 ** max(attempts - 1, 0)))
+
+
+def _mongo_outbox_entry(payload):
+    return MongoSyncOutbox(
+        machine_id=payload["machine_id"],
+        license_key=payload["license_key"],
+        payload={
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in payload.items()
+        },
+    )
+
+
+def enqueue_mongo_sync(payload):
+    runtime_mongo = get_runtime_mongo_config()
+    if not runtime_mongo["mongo_uri"]:
+        return False, "Mongo URI empty. Saved only in local Django database."
+
+    entry = _mongo_outbox_entry(payload)
+    # The newest key supersedes anything still queued for the machine; an
+    # older row retried later would otherwise overwrite it in Mongo.
+    MongoSyncOutbox.objects.filter(machine_id=entry.machine_id).delete()
+    entry.save()
+    transaction.on_commit(wake_mongo_outbox_worker)
+    return True, "Queued for MongoDB sync."
+
+
+def enqueue_many_mongo_sync(payloads):
+    runtime_mongo = get_runtime_mongo_config()
+    if not runtime_mongo["mongo_uri"]:
+        return False, "Mongo URI empty. Saved only in local Django database."
+
+    entries = [_mongo_outbox_entry(payload) for payload in payloads]
+    MongoSyncOutbox.objects.filter(machine_id__in=[entry.machine_id for entry in entries]).delete()
+    MongoSyncOutbox.objects.bulk_create(entries, batch_size=500)
+    transaction.on_commit(wake_mongo_outbox_worker)
+    return True, "Queued for MongoDB sync."
+
+
+def _outbox_payload(entry):
+    payload = dict(entry.payload)
+    for field_name in ("generated_at", "valid_until"):
+        value = payload.get(field_name)
+        if isinstance(value, str):
+            payload[field_name] = parse_datetime(value)
+    return payload
+
+
+def drain_mongo_sync_outbox(batch_size=100, now=None):
+    now = now or datetime.now(timezone.utc)
+    lease = timedelta(seconds=_int_setting("LICENSE_MONGO_OUTBOX_LEASE_SECONDS", 60, minimum=1))
+    synced = 0
+    failed = 0
+
+    entries = list(
+        MongoSyncOutbox.objects.filter(next_attempt_at__lte=now).order_by("id")[
+            : max(1, int(batch_size))
+        ]
+    )
+    claimed_entries = []
+    for entry in entries:
+        # Lease the row so a second worker (or process) skips it. If this
+        # process dies mid-sync the lease runs out and the row is retried.
+        claimed = MongoSyncOutbox.objects.filter(
+            pk=entry.pk, next_attempt_at=entry.next_attempt_at
+        ).update(next_attempt_at=now + lease)
+        if claimed:
+            claimed_entries.append(entry)
+
+    # Rows come in id order, so only the last claimed row per machine is
+    # current; older ones are dropped instead of overwriting it.
+    latest_entries = {entry.machine_id: entry for entry in claimed_entries}
+    stale_ids = [entry.pk for entry in claimed_entries if latest_entries[entry.machine_id] is not entry]
+    if stale_ids:
+        MongoSyncOutbox.objects.filter(pk__in=stale_ids).delete()
+    claimed_entries = list(latest_entries.values())
+
+    results = sync_many_to_mongo(_outbox_payload(entry) for entry in claimed_entries)
+    for entry, (ok, message) in zip(claimed_entries, results):
+        if ok:
+            MongoSyncOutbox.objects.filter(pk=entry.pk).delete()
+            synced += 1
+            continue
+
+        attempts = entry.attempts + 1
+        MongoSyncOutbox.objects.filter(pk=entry.pk).update(
+            attempts=attempts,
+            last_error=message,
+            next_attempt_at=now + _mongo_outbox_backoff(attempts),
+            updated_at=now,
+        )
+        failed += 1
+
+    return synced, failed
+
+
+class MongoOutboxWorker(threading.Thread):
+    def __init__(self):
+        super().__init__(name="license-mongo-outbox", daemon=True)
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+
+    def run(self):
+        poll_seconds = _int_setting("LICENSE_MONGO_OUTBOX_POLL_SECONDS", 5, minimum=1)
+        while not self.stop_event.is_set():
+            self.wake_event.clear()
+            synced = 0
+            try:
+                synced, _failed = drain_mongo_sync_outbox()
+            except Exception:
+                logger.exception("Mongo outbox drain failed.")
+            finally:
+                close_old_connections()
+            if not synced:
+                self.wake_event.wait(poll_seconds)
+
+    def wake(self):
+        self.wake_event.set()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+
+
+_outbox_worker = None
+_outbox_worker_lock = threading.Lock()
+
+
+def start_mongo_outbox_worker():
+    global _outbox_worker
+    if not getattr(settings, "LICENSE_MONGO_OUTBOX_WORKER_ENABLED", True):
+        return None
+
+    with _outbox_worker_lock:
+        if _outbox_worker is None or not _outbox_worker.is_alive():
+            _outbox_worker = MongoOutboxWorker()
+            _outbox_worker.start()
+        return _outbox_worker
+
+
+def wake_mongo_outbox_worker():
+    worker = _outbox_worker
+    if worker is not None and worker.is_alive():
+        worker.wake()
+
+
+def start_background_workers():
+    # Called from the ASGI/WSGI entry points (runserver loads the WSGI one),
+    # so every server process drains the outbox; each starter is idempotent.
+    start_license_key_prewarm_scheduler()
+    start_mongo_outbox_worker()
+    start_mongo_mirror_worker()
+
+
+def _license_stats_bounds(now=None):
+    now = now or django_timezone.now()
+    today_start = django_timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    validity = timedelta(minutes=get_license_key_validity_minutes())
+    return now, today_start, validity
+
+
+def _license_expired_q(now):
+    # valid_until is always set (backfilled in 0010), so both sides are plain
+    # range scans on the (valid_until, generated_at) index.
+    return Q(valid_until__lt=now)
+
+
+def _license_valid_q(now):
+    return Q(valid_until__gte=now)
+
+
+def annotate_license_validity(queryset, now=None):
+    now = now or django_timezone.now()
+    return queryset.annotate(
+        is_valid=Case(
+            When(_license_valid_q(now), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        )
+    )
+
+
+def _license_stats_aggregates(now=None):
+    now, today_start, _validity = _license_stats_bounds(now)
+    return {
+        "total_keys": Count("id"),
+        "today_keys": Count("id", filter=Q(generated_at__gte=today_start)),
+        "unique_machines": Count("machine_id", distinct=True),
+        "expired_keys_count": Count("id", filter=_license_expired_q(now)),
+        "last_generated": Max("generated_at"),
+    }
+
+
+def _aggregate_license_stats(queryset, now=None):
+    return queryset.order_by().aggregate(**_license_stats_aggregates(now))
+
+
+def get_local_license_stats(now=None):
+    return _aggregate_license_stats(GeneratedLicense.objects.all(), now=now)
+
+
+async def aget_local_license_stats(now=None):
+    return await GeneratedLicense.objects.order_by().aaggregate(**_license_stats_aggregates(now))
+
+
+def _mongo_stats_cache_key(runtime_mongo, today_start, generation):
+    return (
+        f"licenses:mongo_stats:{generation or 0}:{_mongo_target_hash(runtime_mongo)}:"
+        f"{today_start.date().isoformat()}"
+    )
+
+
+def _mongo_license_stats_pipeline(now, today_start, validity):
+    now_utc = now.astimezone(timezone.utc)
+    today_start_utc = today_start.astimezone(timezone.utc)
+    valid_until = {
+        "$ifNull": ["$valid_until", {"$add": ["$generated_at", int(validity.total_seconds() * 1000)]}]
+    }
+    return [
+        {
+            "$group": {
+                "_id": "$machine_id",
+                "keys": {"$sum": 1},
+                "today": {"$sum": {"$cond": [{"$gte": ["$generated_at", today_start_utc]}, 1, 0]}},
+                "expired": {"$sum": {"$cond": [{"$lt": [valid_until, now_utc]}, 1, 0]}},
+                "last": {"$max": "$generated_at"},
+            }
+        },
+        {
+            "$group": {
+                "_id": None,
+                "total_keys": {"$sum": "$keys"},
+                "today_keys": {"$sum": "$today"},
+                "unique_machines": {"$sum": 1},
+                "expired_keys_count": {"$sum": "$expired"},
+                "last_generated": {"$max": "$last"},
+            }
+        },
+    ]
+
+
+def _mongo_license_stats_from_rows(rows):
+    row = rows[0] if rows else {}
+    last_generated = row.get("last_generated")
+    if last_generated is not None and last_generated.tzinfo is None:
+        last_generated = last_generated.replace(tzinfo=timezone.utc)
+    return {
+        "total_keys": row.get("total_keys", 0),
+        "today_keys": row.get("today_keys", 0),
+        "unique_machines": row.get("unique_machines", 0),
+        "expired_keys_count": row.get("expired_keys_count", 0),
+        "last_generated": last_generated,
+    }
+
+
+async def afetch_mongo_license_stats(now=None):
+    runtime_mongo = await sync_to_async(get_runtime_mongo_config)()
+    if not runtime_mongo["mongo_uri"]:
+        return None
+    return await run_on_mongo_loop(
+        _afetch_mongo_license_stats(runtime_mongo, *_license_stats_bounds(now))
+    )
+
+
+async def _afetch_mongo_license_stats(runtime_mongo, now, today_start, validity):
+    if importlib.util.find_spec("pymongo") is None:
+        return None
+
+    cache_key = _mongo_stats_cache_key(
+        runtime_mongo, today_start, await cache.aget(_MONGO_RECENT_GENERATION_KEY)
+    )
+    cached_stats = await cache.aget(cache_key)
+    if cached_stats is not None:
+        return cached_stats
+
+    if not _mongo_breaker.allow_request():
+        return None
+
+    try:
+        collection = _aget_mongo_collection(runtime_mongo)
+        cursor = await collection.aggregate(
+            _mongo_license_stats_pipeline(now, today_start, validity), allowDiskUse=True
+        )
+        rows = await cursor.to_list()
+    except Exception as exc:
+        _mongo_breaker.record_failure(exc)
+        return None
+
+    _mongo_breaker.record_success()
+    stats = _mongo_license_stats_from_rows(rows)
+    await cache.aset(cache_key, stats, _int_setting("LICENSE_MONGO_RECENT_CACHE_SECONDS", 15))
+    return stats
+
+
+def _combine_license_stats(stats, remote_stats):
+    if not remote_stats:
+        return stats
+
+    # Every local row is pushed to the same Mongo collection, so the remote
+    # figures cover the local ones once the outbox has drained. Taking the
+    # larger value per figure stays right while the outbox is still behind.
+    combined = {}
+    for key, local_value in stats.items():
+        remote_value = remote_stats.get(key)
+        if local_value is None or remote_value is None:
+            combined[key] = local_value if remote_value is None else remote_value
+        else:
+            combined[key] = max(local_value, remote_value)
+    return combined
+
+
+async def await_with_deadline(task, deadline):
+    # A task that misses the deadline is not cancelled. The Mongo read itself
+    # runs on the Mongo loop (run_on_mongo_loop), so a late answer still fills
+    # the cache for the next request even once this request's loop is closed.
+    done, _pending = await asyncio.wait({task}, timeout=max(0, deadline - time.monotonic()))
+    if task not in done:
+        return None, True
+    return task.result(), False
+
+
+async def aget_license_stats(now=None, deadline=None):
+    if is_mongo_mirror_enabled():
+        stats, remote_stats = await asyncio.gather(
+            aget_local_license_stats(now=now),
+            MongoLicenseMirror.objects.order_by().aaggregate(**_license_stats_aggregates(now)),
+        )
+        return _combine_license_stats(stats, remote_stats), False
+
+    if deadline is None:
+        deadline = time.monotonic() + get_mongo_fetch_deadline_seconds()
+    remote_task = asyncio.ensure_future(afetch_mongo_license_stats(now=now))
+    stats = await aget_local_license_stats(now=now)
+    remote_stats, remote_delayed = await await_with_deadline(remote_task, deadline)
+    return _combine_license_stats(stats, remote_stats), remote_delayed
+
+
+def _license_validator_aggregates(now):
+    return {
+        "last_updated": Max("updated_at"),
+        "total": Count("id"),
+        "last_expiry": Max("valid_until", filter=Q(valid_until__lte=now)),
+        "next_expiry": Min("valid_until", filter=Q(valid_until__gt=now)),
+    }
+
+
+def _isoformat_or_blank(value):
+    return value.isoformat() if value is not None else ""
+
+
+def _license_listing_validator(now, local, mirror, runtime_mongo, mongo_generation):
+    # The rendered lists change on a local write (updated_at, count), when the
+    # next key expires, when the local day rolls over, on a Mongo config change
+    # and, for live Mongo reads, once per recent-cache period.
+    today_start = django_timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    parts = [
+        _isoformat_or_blank(local["last_updated"]),
+        str(local["total"]),
+        _isoformat_or_blank(local["next_expiry"]),
+        today_start.date().isoformat(),
+        _mongo_target_hash(runtime_mongo),
+        str(mongo_generation or 0),
+        _mongo_breaker.snapshot()["state"],
+    ]
+    moments = [local["last_updated"], local["last_expiry"], today_start]
+    if mirror is not None:
+        parts.extend([_isoformat_or_blank(mirror["last_updated"]), str(mirror["total"])])
+        moments.append(mirror["last_updated"])
+    elif runtime_mongo["mongo_uri"]:
+        period = _int_setting("LICENSE_MONGO_RECENT_CACHE_SECONDS", 15, minimum=1)
+        bucket = int(now.timestamp()) // period
+        parts.append(str(bucket))
+        moments.append(datetime.fromtimestamp(bucket * period, tz=timezone.utc))
+
+    return {
+        "etag": hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32],
+        "last_modified": max(moment for moment in moments if moment is not None),
+    }
+
+
+async def aget_license_listing_validator(now=None):
+    now = now or django_timezone.now()
+    local = await GeneratedLicense.objects.order_by().aaggregate(**_license_validator_aggregates(now))
+    mirror = None
+    if is_mongo_mirror_enabled():
+        mirror = await MongoLicenseMirror.objects.order_by().aaggregate(
+            last_updated=Max("mirrored_at"), total=Count("id")
+        )
+    return _license_listing_validator(
+        now,
+        local,
+        mirror,
+        await sync_to_async(get_runtime_mongo_config)(),
+        await cache.aget(_MONGO_RECENT_GENERATION_KEY),
+    )
+
+
+def _encode_position_cursor(moment, pk):
+    raw = f"{moment.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def encode_license_cursor(item):
+    return _encode_position_cursor(item.generated_at, item.id)
+
+
+def decode_license_cursor(cursor):
+    value = (cursor or "").strip()
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode("utf-8")
+        generated_at_raw, pk_raw = raw.rsplit("|", 1)
+        generated_at = parse_datetime(generated_at_raw)
+        pk = int(pk_raw)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if generated_at is None or generated_at.tzinfo is None:
+        return None
+    return generated_at, pk
+
+
+def _local_day_start(value):
+    return django_timezone.make_aware(datetime.combine(value, datetime_time.min))
+
+
+def filter_generated_licenses(
+    queryset=None,
+    *,
+    status="",
+    machine_prefix="",
+    customer="",
+    date_from=None,
+    date_to=None,
+    now=None,
+):
+    queryset = GeneratedLicense.objects.all() if queryset is None else queryset
+    now = now or django_timezone.now()
+
+    if status == "valid":
+        queryset = queryset.filter(_license_valid_q(now))
+    elif status == "expired":
+        queryset = queryset.filter(_license_expired_q(now))
+
+    machine_prefix = normalize_machine_id(machine_prefix)
+    if machine_prefix:
+        queryset = queryset.filter(machine_id__startswith=machine_prefix)
+
+    customer = (customer or "").strip()
+    if customer:
+        # Served on PostgreSQL by the UPPER(customer_name) index (migration 0014).
+        queryset = queryset.filter(customer_name__istartswith=customer)
+
+    if date_from:
+        queryset = queryset.filter(generated_at__gte=_local_day_start(date_from))
+    if date_to:
+        queryset = queryset.filter(generated_at__lt=_local_day_start(date_to + timedelta(days=1)))
+
+    return queryset
+
+
+def browse_licenses(queryset, *, after=None, before=None, page_size=50):
+    # Seek pagination on (generated_at, id): every page is an index range scan,
+    # so deep pages cost the same as the first one.
+    page_size = max(1, int(page_size))
+    queryset = annotate_license_validity(queryset)
+    before_position = decode_license_cursor(before)
+    after_position = decode_license_cursor(after)
+
+    if before_position:
+        generated_at, pk = before_position
+        queryset = queryset.filter(
+            Q(generated_at__gt=generated_at) | Q(generated_at=generated_at, id__gt=pk)
+        ).order_by("generated_at", "id")
+    else:
+        if after_position:
+            generated_at, pk = after_position
+            queryset = queryset.filter(
+                Q(generated_at__lt=generated_at) | Q(generated_at=generated_at, id__lt=pk)
+            )
+        queryset = queryset.order_by("-generated_at", "-id")
+
+    items = license_records(queryset[: page_size + 1])
+    has_more = len(items) > page_size
+    items = items[:page_size]
+
+    if before_position:
+        items.reverse()
+        has_previous, has_next = has_more, True
+    else:
+        has_previous, has_next = after_position is not None, has_more
+
+    return {
+        "items": items,
+        "previous_cursor": encode_license_cursor(items[0]) if items and has_previous else "",
+        "next_cursor": encode_license_cursor(items[-1]) if items and has_next else "",
+    }
+
+
+def license_changes_cursor():
+    position = GeneratedLicense.objects.order_by("-updated_at", "-id").values_list("updated_at", "id").first()
+    return _encode_position_cursor(*position) if position else ""
+
+
+async def alicense_changes_cursor():
+    position = await GeneratedLicense.objects.order_by("-updated_at", "-id").values_list("updated_at", "id").afirst()
+    return _encode_position_cursor(*position) if position else ""
+
+
+def fetch_license_changes(since=None, limit=200):
+    # Seek on (updated_at, id): a poll only reads the rows written after the
+    # client's cursor instead of reloading the whole recent list.
+    limit = max(1, int(limit))
+    queryset = annotate_license_validity(GeneratedLicense.objects.all())
+    position = decode_license_cursor(since)
+    if position is None:
+        # No usable cursor: hand out the current one, the page itself is fresh.
+        return {"items": [], "cursor": license_changes_cursor(), "has_more": False}
+    updated_at, pk = position
+    columns = (*_LICENSE_RECORD_COLUMNS, "updated_at")
+    rows = list(
+        queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk))
+        .order_by("updated_at", "id")
+        .values_list(*columns)[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # updated_at is stamped before commit, so a slow transaction can land
+    # behind a cursor the client already holds. Re-send the rows just behind
+    # the cursor as well; the dashboard replaces rows by machine_id.
+    overlap = timedelta(seconds=_int_setting("LICENSE_CHANGES_OVERLAP_SECONDS", 5))
+    late_rows = []
+    if overlap:
+        late_rows = list(
+            queryset.filter(updated_at__gt=updated_at - overlap)
+            .filter(Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, id__lt=pk))
+            .order_by("-updated_at", "-id")
+            .values_list(*columns)[:limit]
+        )
+        late_rows.reverse()
+
+    return {
+        "items": [LicenseRecord.from_row(row[:-1]) for row in late_rows + rows],
+        "cursor": _encode_position_cursor(rows[-1][-1], rows[-1][-2]) if rows else since,
+        "has_more": has_more,
+    }
+
+
+_LICENSE_UPSERT_FIELDS = [
+    "license_key",
+    "customer_name",
+    "contact_email",
+    "note",
+    "generated_by",
+    "status",
+    "source",
+    "generated_at",
+    "valid_until",
+    "updated_at",
+]
+LICENSE_IMPORT_COLUMNS = ("machine_id", "customer_name", "contact_email", "note")
+
+
+def upsert_generated_licenses(records, batch_size=None):
+    # INSERT ... ON CONFLICT (machine_id) DO UPDATE keeps a single row per
+    # machine even when two writers generate for it at the same time.
+    return GeneratedLicense.objects.bulk_create(
+        records,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["machine_id"],
+        update_fields=_LICENSE_UPSERT_FIELDS,
+    )
+
+
+def _import_license_chunk(chunk, *, generated_by, source, generated_at, valid_until, report):
+    license_keys = generate_machine_license_keys(
+        [values["machine_id"] for _line_number, values in chunk], generated_at=generated_at
+    )
+    line_numbers = {values["machine_id"]: line_number for line_number, values in chunk}
+    records = []
+    payloads = []
+    for (_line_number, values), license_key in zip(chunk, license_keys):
+        common = {
+            **values,
+            "license_key": license_key,
+            "generated_by": generated_by,
+            "status": "valid",
+            "source": source,
+            "generated_at": generated_at,
+            "valid_until": valid_until,
+        }
+        records.append(GeneratedLicense(**common))
+        payloads.append(common)
+
+    if not records:
+        return
+    try:
+        with transaction.atomic():
+            upsert_generated_licenses(records, batch_size=500)
+            queued, message = enqueue_many_mongo_sync(payloads)
+            imported = {"count": len(records)}
+            transaction.on_commit(lambda: publish_license_event("licenses-imported", imported))
+    except DatabaseError as exc:
+        for record in records:
+            report["errors"].append(
                 {
-                    "license_key": item.get("license_key", ""),
-                    "machine_id": item.get("machine_id", ""),
-                    "license_email": item.get("license_email", settings.LICENSE_EMAIL),
-                    "customer_name": item.get("customer_name", ""),
-                    "contact_email": item.get("contact_email", ""),
-                    "note": item.get("note", ""),
-                    "generated_by": item.get("generated_by", ""),
-                    "generated_at": generated_at,
-                    "valid_until": valid_until,
-                    "created_at": created_at,
-                    "status": item.get("status", "generated"),
-                    "source": item.get("source", getattr(settings, "LICENSE_SOURCE", "license_manager_page")),
+                    "line": line_numbers[record.machine_id],
+                    "machine_id": record.machine_id,
+                    "error": f"Not saved: {exc}",
                 }
             )
+        return
 
-        return documents
+    report["imported"] += len(records)
+    if not queued:
+        report["mongo_message"] = message
+
+
+def import_machine_licenses(rows, *, generated_by, source=None, chunk_size=1000, generated_at=None):
+    source = source or getattr(settings, "LICENSE_SOURCE", "license_manager_web")
+    generated_at = generated_at or django_timezone.now()
+    valid_until = calculate_license_valid_until(generated_at)
+    chunk_size = max(1, int(chunk_size))
+    report = {"rows": 0, "imported": 0, "errors": [], "mongo_message": ""}
+    seen_lines = {}
+    chunk = []
+
+    # rows yields (line_number, row dict); only one chunk is held in memory.
+    for line_number, row in rows:
+        report["rows"] += 1
+        machine_id = normalize_machine_id(row.get("machine_id"))
+        error = machine_id_error(machine_id)
+        if not error and machine_id in seen_lines:
+            error = f"Duplicate machine ID (first seen on line {seen_lines[machine_id]})."
+        if error:
+            report["errors"].append({"line": line_number, "machine_id": machine_id, "error": error})
+            continue
+
+        seen_lines[machine_id] = line_number
+        chunk.append(
+            (
+                line_number,
+                {
+                    "machine_id": machine_id,
+                    "customer_name": (row.get("customer_name") or "").strip(),
+                    "contact_email": (row.get("contact_email") or "").strip().lower(),
+                    "note": (row.get("note") or "").strip(),
+                },
+            )
+        )
+        if len(chunk) >= chunk_size:
+            _import_license_chunk(
+                chunk,
+                generated_by=generated_by,
+                source=source,
+                generated_at=generated_at,
+                valid_until=valid_until,
+                report=report,
+            )
+            chunk = []
+
+    if chunk:
+        _import_license_chunk(
+            chunk,
+            generated_by=generated_by,
+            source=source,
+            generated_at=generated_at,
+            valid_until=valid_until,
+            report=report,
+        )
+    report["errors"].sort(key=lambda error: error["line"])
+    return report
+
+
+def import_machine_licenses_csv(stream, **kwargs):
+    reader = csv.DictReader(stream)
+    fieldnames = [(name or "").strip().lower() for name in (reader.fieldnames or [])]
+    if "machine_id" not in fieldnames:
+        return {
+            "rows": 0,
+            "imported": 0,
+            "errors": [{"line": 1, "machine_id": "", "error": "CSV header must include machine_id."}],
+            "mongo_message": "",
+        }
+    reader.fieldnames = fieldnames
+    rows = ((reader.line_num, row) for row in reader)
+    return import_machine_licenses(rows, **kwargs)
+
+
+LICENSE_EXPORT_FORMATS = ("csv", "ndjson")
+
+
+def open_mongo_export_cursor(batch_size=2000):
+    runtime_mongo = get_runtime_mongo_config()
+    if not runtime_mongo["mongo_uri"]:
+        return None, "Mongo URI empty. Only local licenses can be exported."
+
+    try:
+        from pymongo import DESCENDING
     except Exception:
-        return []
-    finally:
-        if client is not None:
-            client.close()
+        return None, "pymongo not installed. Only local licenses can be exported."
+
+    if not _mongo_breaker.allow_request():
+        return None, _mongo_circuit_open_message()
+
+    collection = _get_mongo_collection(runtime_mongo)
+    cursor = (
+        collection.find({}, _LICENSE_RECORD_PROJECTION)
+        .sort("generated_at", DESCENDING)
+        .batch_size(max(1, int(batch_size)))
+    )
+    return cursor, ""
+
+
+def _iter_mongo_export_records(mongo_cursor):
+    try:
+        for document in mongo_cursor:
+            yield LicenseRecord.from_document(document)
+    except Exception as exc:
+        _mongo_breaker.record_failure(exc)
+        raise
+    _mongo_breaker.record_success()
+
+
+def _millisecond_bucket(value):
+    if value is None:
+        return None
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def iter_license_export_records(mongo_cursor=None, chunk_size=2000):
+    # Rows stream from a chunked database cursor (and the Mongo cursor, both
+    # newest first), so memory stays flat however large the ledger is.
+    local_records = (
+        LicenseRecord.from_row(row)
+        for row in GeneratedLicense.objects.order_by("-generated_at", "-id")
+        .values_list(*_LICENSE_RECORD_FIELDS)
+        .iterator(chunk_size=max(1, int(chunk_size)))
+    )
+    if mongo_cursor is None:
+        yield from local_records
+        return
+
+    minimum_dt = datetime.min.replace(tzinfo=timezone.utc)
+    merged = heapq.merge(
+        local_records,
+        _iter_mongo_export_records(mongo_cursor),
+        key=lambda item: item.generated_at or minimum_dt,
+        reverse=True,
+    )
+    # A key synced to Mongo carries its local generated_at (stored with
+    # millisecond precision), so duplicates sit next to each other and only
+    # the rows of the current millisecond need remembering. Machines can share
+    # a key, so a row is identified by machine and key together.
+    current_bucket = None
+    seen_rows = set()
+    for record in merged:
+        bucket = _millisecond_bucket(record.generated_at)
+        if bucket != current_bucket:
+            current_bucket = bucket
+            seen_rows.clear()
+        row_key = (record.machine_id, record.license_key)
+        if row_key in seen_rows:
+            continue
+        seen_rows.add(row_key)
+        yield record
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def iter_license_export_lines(records, export_format="csv", chunk_size=2000):
+    # Rows are joined into chunks so each write/yield carries many lines.
+    chunk_size = max(1, int(chunk_size))
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == "csv" else None
+    if writer is not None:
+        writer.writerow(_LICENSE_RECORD_FIELDS)
+
+    pending = 0
+    for record in records:
+        values = [_export_value(getattr(record, field)) for field in _LICENSE_RECORD_FIELDS]
+        if writer is not None:
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(_LICENSE_RECORD_FIELDS, values)), cls=DjangoJSONEncoder))
+            buffer.write("\n")
+        pending += 1
+        if pending >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+LICENSE_EVENT_QUEUE_SIZE = 100
+LICENSE_EVENT_HEARTBEAT_SECONDS = 15
+LICENSE_EVENT_EXPIRY_CHECK_SECONDS = 60
+
+
+def format_license_event(event, data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+class LicenseEventHub:
+    # In-process fan-out for the live dashboard stream: one publish reaches
+    # every connected watcher, and one expiry watcher per event loop serves
+    # all of them. Publishers may run on any thread.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._expiry_tasks = {}
+
+    def subscribe(self):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=LICENSE_EVENT_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[queue] = loop
+            task = self._expiry_tasks.get(loop)
+            if task is None or task.done():
+                self._expiry_tasks[loop] = loop.create_task(self._watch_expiry())
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            loop = self._subscribers.pop(queue, None)
+            if loop is None or loop in self._subscribers.values():
+                return
+            task = self._expiry_tasks.pop(loop, None)
+        if task is not None:
+            task.cancel()
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event, data):
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, (event, data))
+            except RuntimeError:
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _deliver(queue, message):
+        if queue.full():
+            # A stalled watcher drops its oldest event instead of holding up the rest.
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+    async def next_expiry_wait(self, now):
+        next_expiry = (
+            await GeneratedLicense.objects.filter(valid_until__gt=now)
+            .order_by("valid_until")
+            .values_list("valid_until", flat=True)
+            .afirst()
+        )
+        if next_expiry is None:
+            return LICENSE_EVENT_EXPIRY_CHECK_SECONDS
+        return min(LICENSE_EVENT_EXPIRY_CHECK_SECONDS, max(0.0, (next_expiry - now).total_seconds()))
+
+    async def publish_expired(self, checked_at, now):
+        queryset = (
+            GeneratedLicense.objects.filter(valid_until__gt=checked_at, valid_until__lte=now)
+            .order_by("valid_until")
+            .values_list("machine_id", flat=True)
+        )
+        machine_ids = [machine_id async for machine_id in queryset[:500]]
+        if machine_ids:
+            self.publish("license-expired", {"machine_ids": machine_ids})
+        return machine_ids
+
+    async def _watch_expiry(self):
+        checked_at = django_timezone.now()
+        while True:
+            try:
+                await asyncio.sleep(await self.next_expiry_wait(checked_at) + 0.05)
+                now = django_timezone.now()
+                await self.publish_expired(checked_at, now)
+                checked_at = now
+            except DatabaseError:
+                logger.exception("License expiry watcher failed; retrying.")
+                await asyncio.sleep(LICENSE_EVENT_EXPIRY_CHECK_SECONDS)
+
+
+license_event_hub = LicenseEventHub()
+
+
+def publish_license_event(event, data):
+    license_event_hub.publish(event, data)
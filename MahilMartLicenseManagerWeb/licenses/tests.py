@@ -1,20 +1,78 @@
+import asyncio
+import csv
+import importlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
 from datetime import datetime, timedelta, timezone as datetime_timezone
-from unittest.mock import patch
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
 
+from asgiref.sync import async_to_sync, sync_to_async
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
-from .models import GeneratedLicense, LicenseRuntimeConfig
+from .models import (
+    GeneratedLicense,
+    LicenseRuntimeConfig,
+    MongoLicenseMirror,
+    MongoMirrorState,
+    MongoSyncOutbox,
+)
 from .services import (
+    LicenseEventHub,
+    LicenseRecord,
+    _license_key_cache,
+    afetch_mongo_license_stats,
+    afetch_recent_mongo_licenses,
+    aget_license_listing_validator,
+    aget_license_stats,
+    await_with_deadline,
+    _seconds_until_license_key_prewarm,
+    annotate_license_validity,
+    browse_licenses,
+    clear_license_key_cache,
+    close_mongo_clients,
+    drain_mongo_sync_outbox,
+    enqueue_mongo_sync,
+    fetch_license_changes,
+    filter_generated_licenses,
+    _mongo_breaker,
+    _mongo_recent_cache_key,
     generate_machine_license_key,
+    generate_machine_license_keys,
+    get_license_key_cache_stats,
+    get_local_license_stats,
+    get_mongo_circuit_state,
+    get_runtime_mongo_config,
+    import_machine_licenses_csv,
+    invalidate_runtime_mongo_config,
     is_browser_style_machine_id,
     is_machine_id_valid,
+    license_changes_cursor,
+    iter_license_export_lines,
+    iter_license_export_records,
     normalize_machine_id,
+    prewarm_next_window_license_keys,
+    read_shared_mongo_config,
+    save_shared_mongo_config,
+    sync_many_to_mongo,
+    sync_mongo_license_mirror,
+    sync_to_mongo,
+    verify_machine_license_key,
 )
+from .views import _merge_recent_licenses, _save_license_for_machine
 
 
 class LicenseServiceTests(TestCase):
@@ -70,6 +128,1593 @@ class LicenseServiceTests(TestCase):
 
         self.assertEqual(key_one, key_two)
 
+    def test_batch_license_key_generation_matches_single_key_generation(self):
+        fixed_generated_at = datetime(2026, 2, 13, 12, 0, tzinfo=datetime_timezone.utc)
+        machine_ids = [f"desktop-{index:04d}" for index in range(150)] + ["DESKTOP-123"]
+
+        batch_keys = generate_machine_license_keys(machine_ids, generated_at=fixed_generated_at)
+
+        self.assertEqual(
+            batch_keys,
+            [
+                generate_machine_license_key(machine_id, generated_at=fixed_generated_at)
+                for machine_id in machine_ids
+            ],
+        )
+
+    @override_settings(LICENSE_KEY_SEED_MODE="pos_static")
+    def test_batch_license_key_generation_matches_single_keys_in_pos_static_mode(self):
+        machine_ids = ["DESKTOP-123", "desktop-456", "POS.TERMINAL_9"]
+
+        self.assertEqual(
+            generate_machine_license_keys(machine_ids),
+            [generate_machine_license_key(machine_id) for machine_id in machine_ids],
+        )
+
+
+class LicenseKeyCacheTests(TestCase):
+    def setUp(self):
+        clear_license_key_cache()
+
+    def test_repeated_generation_in_same_window_is_served_from_cache(self):
+        now = timezone.now()
+        key_one = generate_machine_license_key("DESKTOP-123", generated_at=now)
+        key_two = generate_machine_license_key("desktop-123", generated_at=now)
+
+        self.assertEqual(key_one, key_two)
+        stats = get_license_key_cache_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["size"], 1)
+
+    def test_cached_entry_is_evicted_when_its_window_closes(self):
+        generate_machine_license_key("DESKTOP-123")
+        later = timezone.now() + timedelta(minutes=21)
+
+        self.assertEqual(get_license_key_cache_stats()["size"], 1)
+        self.assertIsNone(_license_key_cache.get("unused-seed", now=later))
+        self.assertEqual(get_license_key_cache_stats()["size"], 0)
+
+    def test_keys_for_closed_windows_are_not_cached(self):
+        generate_machine_license_key(
+            "DESKTOP-123",
+            generated_at=datetime(2026, 2, 13, 12, 0, tzinfo=datetime_timezone.utc),
+        )
+
+        self.assertEqual(get_license_key_cache_stats()["size"], 0)
+
+    @override_settings(LICENSE_KEY_CACHE_SIZE=2)
+    def test_cache_is_bounded_by_least_recently_used_eviction(self):
+        for machine_id in ("DESKTOP-1", "DESKTOP-2", "DESKTOP-3"):
+            generate_machine_license_key(machine_id)
+
+        self.assertEqual(get_license_key_cache_stats()["size"], 2)
+
+
+class LicenseKeyPrewarmTests(TestCase):
+    def setUp(self):
+        clear_license_key_cache()
+
+    def test_prewarm_stages_next_window_keys_for_known_machines(self):
+        for index, machine_id in enumerate(("DESKTOP-1", "DESKTOP-2")):
+            GeneratedLicense.objects.create(machine_id=machine_id, license_key=f"Key{index}@abc")
+        now = timezone.now()
+        next_window = now + timedelta(minutes=10)
+
+        staged = prewarm_next_window_license_keys(now=now)
+        misses_after_prewarm = get_license_key_cache_stats()["misses"]
+        generate_machine_license_key("DESKTOP-1", generated_at=next_window)
+        generate_machine_license_key("DESKTOP-2", generated_at=next_window)
+
+        self.assertEqual(staged, 2)
+        stats = get_license_key_cache_stats()
+        self.assertEqual(stats["misses"], misses_after_prewarm)
+        self.assertEqual(stats["hits"], 2)
+
+    @override_settings(LICENSE_KEY_CACHE_SIZE=4)
+    def test_prewarm_leaves_half_the_cache_for_the_current_window(self):
+        for index in range(5):
+            GeneratedLicense.objects.create(machine_id=f"DESKTOP-{index}", license_key=f"Key{index}@abc")
+
+        staged = prewarm_next_window_license_keys(now=timezone.now())
+
+        self.assertEqual(staged, 2)
+        self.assertEqual(get_license_key_cache_stats()["size"], 2)
+
+    @override_settings(LICENSE_KEY_SEED_MODE="pos_static")
+    def test_prewarm_is_skipped_in_pos_static_mode(self):
+        GeneratedLicense.objects.create(machine_id="DESKTOP-1", license_key="Key1@abc")
+
+        self.assertEqual(prewarm_next_window_license_keys(), 0)
+
+    @override_settings(LICENSE_KEY_PREWARM_LEAD_MINUTES=2)
+    def test_prewarm_runs_lead_minutes_before_the_window_boundary(self):
+        now = datetime(2026, 2, 13, 12, 3, tzinfo=datetime_timezone.utc)
+        self.assertEqual(_seconds_until_license_key_prewarm(now), 5 * 60)
+
+        now = datetime(2026, 2, 13, 12, 9, tzinfo=datetime_timezone.utc)
+        self.assertEqual(_seconds_until_license_key_prewarm(now), 9 * 60)
+
+    @override_settings(LICENSE_KEY_VALIDITY_MINUTES=1, LICENSE_KEY_PREWARM_LEAD_MINUTES=2)
+    def test_prewarm_delay_is_never_negative_when_lead_exceeds_window(self):
+        now = datetime(2026, 2, 13, 12, 3, 17, tzinfo=datetime_timezone.utc)
+
+        self.assertEqual(_seconds_until_license_key_prewarm(now), 43)
+
+
+class LicenseVerificationTests(TestCase):
+    def setUp(self):
+        clear_license_key_cache()
+        self.url = reverse("licenses:verify_license")
+        self.checked_at = datetime(2026, 2, 13, 12, 5, tzinfo=datetime_timezone.utc)
+
+    def test_key_from_current_window_is_valid(self):
+        license_key = generate_machine_license_key("DESKTOP-123", generated_at=self.checked_at)
+
+        result = verify_machine_license_key("desktop-123", license_key, checked_at=self.checked_at)
+
+        self.assertTrue(result["valid"])
+        self.assertEqual(
+            result["window_start"], datetime(2026, 2, 13, 12, 0, tzinfo=datetime_timezone.utc)
+        )
+
+    def test_key_from_previous_window_is_accepted_within_tolerance(self):
+        license_key = generate_machine_license_key(
+            "DESKTOP-123", generated_at=self.checked_at - timedelta(minutes=10)
+        )
+
+        result = verify_machine_license_key("DESKTOP-123", license_key, checked_at=self.checked_at)
+
+        self.assertTrue(result["valid"])
+
+    def test_key_older_than_tolerance_is_rejected(self):
+        license_key = generate_machine_license_key(
+            "DESKTOP-123", generated_at=self.checked_at - timedelta(minutes=20)
+        )
+
+        with self.settings(LICENSE_KEY_VERIFY_PREVIOUS_WINDOWS=1):
+            result = verify_machine_license_key(
+                "DESKTOP-123", license_key, checked_at=self.checked_at
+            )
+
+        self.assertFalse(result["valid"])
+
+    def test_key_for_other_machine_is_rejected(self):
+        license_key = generate_machine_license_key("DESKTOP-999", generated_at=self.checked_at)
+
+        result = verify_machine_license_key("DESKTOP-123", license_key, checked_at=self.checked_at)
+
+        self.assertFalse(result["valid"])
+
+    def test_failed_verification_does_not_fill_key_cache(self):
+        license_key = generate_machine_license_key("DESKTOP-123", generated_at=self.checked_at)
+        size = get_license_key_cache_stats()["size"]
+
+        for index in range(20):
+            verify_machine_license_key(f"UNKNOWN-{index}", "WrongKey123@abc", checked_at=self.checked_at)
+
+        self.assertEqual(get_license_key_cache_stats()["size"], size)
+        self.assertTrue(verify_machine_license_key("DESKTOP-123", license_key, checked_at=self.checked_at)["valid"])
+
+    def test_verify_endpoint_answers_without_database_queries(self):
+        license_key = generate_machine_license_key("DESKTOP-123")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.url, {"machine_id": "desktop-123", "license_key": license_key}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["valid"])
+        self.assertEqual(response.json()["machine_id"], "DESKTOP-123")
+
+    def test_verify_endpoint_accepts_json_post(self):
+        response = self.client.post(
+            self.url,
+            data={"machine_id": "DESKTOP-123", "license_key": "WrongKey123@abc"},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["valid"])
+
+    def test_verify_endpoint_requires_machine_and_key(self):
+        response = self.client.get(self.url, {"machine_id": "DESKTOP-123"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["valid"])
+
+
+@override_settings(
+    LICENSE_MONGO_URI="mongodb://settings-cluster.example:27017",
+    LICENSE_MONGO_DB="settings_db",
+    LICENSE_MONGO_COLLECTION="settings_keys",
+    LICENSE_SHARED_CONFIG_CHECK_SECONDS=0,
+)
+class RuntimeMongoConfigCacheTests(TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.config_path = Path(temp_dir.name) / "license_mongo_config.ini"
+        env_patcher = patch.dict(
+            os.environ, {"MAHILMARTPOS_SHARED_MONGO_CONFIG_PATH": str(self.config_path)}
+        )
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        invalidate_runtime_mongo_config()
+        self.addCleanup(invalidate_runtime_mongo_config)
+
+    def test_repeated_reads_run_no_queries(self):
+        get_runtime_mongo_config()
+
+        with self.assertNumQueries(0):
+            config = get_runtime_mongo_config()
+
+        self.assertEqual(config["mongo_db"], "settings_db")
+
+    def test_row_changed_by_another_process_is_picked_up_after_max_age(self):
+        LicenseRuntimeConfig.save_singleton(
+            mongo_uri="mongodb://runtime.example:27017",
+            mongo_db="runtime_db",
+            mongo_collection="runtime_keys",
+            updated_by="admin_user",
+        )
+        started = time.monotonic()
+        with patch("licenses.services.time.monotonic", return_value=started):
+            self.assertEqual(get_runtime_mongo_config()["mongo_db"], "runtime_db")
+
+        # A queryset update skips save(), like a write from another worker.
+        LicenseRuntimeConfig.objects.update(mongo_db="other_db")
+
+        with override_settings(LICENSE_RUNTIME_CONFIG_MAX_AGE_SECONDS=2):
+            with patch("licenses.services.time.monotonic", return_value=started + 1):
+                self.assertEqual(get_runtime_mongo_config()["mongo_db"], "runtime_db")
+            with patch("licenses.services.time.monotonic", return_value=started + 3):
+                self.assertEqual(get_runtime_mongo_config()["mongo_db"], "other_db")
+
+    def test_saving_runtime_config_is_picked_up_at_once(self):
+        get_runtime_mongo_config()
+
+        LicenseRuntimeConfig.save_singleton(
+            mongo_uri="mongodb://runtime.example:27017",
+            mongo_db="runtime_db",
+            mongo_collection="runtime_keys",
+            updated_by="admin_user",
+        )
+
+        self.assertEqual(get_runtime_mongo_config()["mongo_db"], "runtime_db")
+
+    def test_shared_ini_is_parsed_only_when_it_changes(self):
+        save_shared_mongo_config(
+            mongo_uri="mongodb://shared.example:27017",
+            mongo_db="shared_db",
+            mongo_collection="shared_keys",
+        )
+
+        with patch(
+            "licenses.services.read_shared_mongo_config",
+            wraps=read_shared_mongo_config,
+        ) as read_mock:
+            self.assertEqual(get_runtime_mongo_config()["mongo_db"], "shared_db")
+            self.assertEqual(get_runtime_mongo_config()["mongo_db"], "shared_db")
+            self.assertEqual(read_mock.call_count, 1)
+
+            self.config_path.write_text(
+                "[mongo]\nmongo_uri = mongodb://shared.example:27017\n"
+                "mongo_db = shared_db_renamed\nmongo_collection = shared_keys\n",
+                encoding="utf-8",
+            )
+            self.assertEqual(get_runtime_mongo_config()["mongo_db"], "shared_db_renamed")
+            self.assertEqual(read_mock.call_count, 2)
+
+
+class MongoConnectionTests(TestCase):
+    def setUp(self):
+        close_mongo_clients()
+        self.addCleanup(close_mongo_clients)
+        self.runtime_mongo = {
+            "mongo_uri": "mongodb://pos-cluster.example:27017",
+            "mongo_db": "license_db",
+            "mongo_collection": "license_keys",
+        }
+        config_patcher = patch(
+            "licenses.services.get_runtime_mongo_config",
+            side_effect=lambda: dict(self.runtime_mongo),
+        )
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+
+    def _payload(self):
+        return {"license_key": "FixedKey123@abc", "machine_id": "DESKTOP-123"}
+
+    @patch("pymongo.MongoClient")
+    def test_client_is_shared_across_calls_without_ping(self, client_class_mock):
+        self.assertTrue(sync_to_mongo(self._payload())[0])
+        self.assertTrue(sync_to_mongo(self._payload())[0])
+
+        client_class_mock.assert_called_once()
+        client_class_mock.return_value.admin.command.assert_not_called()
+        client_class_mock.return_value.close.assert_not_called()
+
+    @patch("pymongo.MongoClient")
+    def test_client_is_rebuilt_when_runtime_uri_changes(self, client_class_mock):
+        first_client = client_class_mock.return_value
+        sync_to_mongo(self._payload())
+
+        self.runtime_mongo["mongo_uri"] = "mongodb://other-cluster.example:27017"
+        sync_to_mongo(self._payload())
+
+        self.assertEqual(client_class_mock.call_count, 2)
+        self.assertEqual(
+            client_class_mock.call_args.args[0], "mongodb://other-cluster.example:27017"
+        )
+        first_client.close.assert_called_once()
+
+
+class ServerEntryPointTests(TestCase):
+    def test_asgi_and_wsgi_entry_points_start_background_workers(self):
+        for module_name in ("license_manager_web.asgi", "license_manager_web.wsgi"):
+            with self.subTest(module_name), patch("licenses.services.start_background_workers") as start_mock:
+                module = importlib.import_module(module_name)
+                start_mock.reset_mock()
+                importlib.reload(module)
+
+                start_mock.assert_called_once_with()
+
+
+class MongoCoalescingWriterTests(TestCase):
+    def setUp(self):
+        close_mongo_clients()
+        self.addCleanup(close_mongo_clients)
+        config_patcher = patch(
+            "licenses.services.get_runtime_mongo_config",
+            return_value={
+                "mongo_uri": "mongodb://pos-cluster.example:27017",
+                "mongo_db": "license_db",
+                "mongo_collection": "license_keys",
+            },
+        )
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+
+    def _collection(self, client_class_mock):
+        client = client_class_mock.return_value
+        return client.__getitem__.return_value.__getitem__.return_value
+
+    @patch("pymongo.MongoClient")
+    def test_pending_documents_are_flushed_as_one_unordered_bulk_write(self, client_class_mock):
+        results = sync_many_to_mongo(
+            [
+                {"license_key": "KeyOne@abc", "machine_id": "DESKTOP-1"},
+                {"license_key": "KeyTwo@abc", "machine_id": "DESKTOP-2"},
+                {"license_key": "KeyThree@abc", "machine_id": "DESKTOP-1"},
+            ]
+        )
+
+        self.assertEqual(results, [(True, "Saved to MongoDB.")] * 3)
+        collection = self._collection(client_class_mock)
+        collection.bulk_write.assert_called_once()
+        operations = collection.bulk_write.call_args.args[0]
+        self.assertEqual(len(operations), 4)
+        self.assertFalse(collection.bulk_write.call_args.kwargs["ordered"])
+        self.assertIn("KeyThree@abc", repr(operations[0]))
+        self.assertNotIn("KeyOne@abc", repr(operations))
+        collection.update_one.assert_not_called()
+
+    @patch("pymongo.MongoClient")
+    def test_bulk_write_errors_are_reported_per_item(self, client_class_mock):
+        from pymongo.errors import BulkWriteError
+
+        self._collection(client_class_mock).bulk_write.side_effect = BulkWriteError(
+            {"writeErrors": [{"index": 2, "code": 11000, "errmsg": "duplicate key"}]}
+        )
+
+        results = sync_many_to_mongo(
+            [
+                {"license_key": "KeyOne@abc", "machine_id": "DESKTOP-1"},
+                {"license_key": "KeyTwo@abc", "machine_id": "DESKTOP-2"},
+            ]
+        )
+
+        self.assertEqual(results[0], (True, "Saved to MongoDB."))
+        self.assertEqual(results[1], (False, "Mongo sync failed: duplicate key"))
+
+    @patch("pymongo.MongoClient")
+    def test_concurrent_callers_share_a_flush(self, client_class_mock):
+        import threading
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda index=index: results.append(
+                    sync_to_mongo({"license_key": f"Key{index}@abc", "machine_id": f"DESKTOP-{index}"})
+                )
+            )
+            for index in range(5)
+        ]
+        with self.settings(LICENSE_MONGO_WRITE_WINDOW_MS=200):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(results, [(True, "Saved to MongoDB.")] * 5)
+        self.assertLess(self._collection(client_class_mock).bulk_write.call_count, 5)
+
+
+@override_settings(
+    LICENSE_MONGO_BREAKER_FAILURE_THRESHOLD=2,
+    LICENSE_MONGO_BREAKER_RESET_SECONDS=30,
+)
+class MongoCircuitBreakerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        close_mongo_clients()
+        self.addCleanup(close_mongo_clients)
+        config_patcher = patch(
+            "licenses.services.get_runtime_mongo_config",
+            return_value={
+                "mongo_uri": "mongodb://pos-cluster.example:27017",
+                "mongo_db": "license_db",
+                "mongo_collection": "license_keys",
+            },
+        )
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+
+    @patch("pymongo.AsyncMongoClient")
+    @patch("pymongo.MongoClient")
+    def test_breaker_opens_after_consecutive_failures_and_fails_fast(
+        self, client_class_mock, async_client_class_mock
+    ):
+        collection = client_class_mock.return_value.__getitem__.return_value.__getitem__.return_value
+        async_collection = (
+            async_client_class_mock.return_value.__getitem__.return_value.__getitem__.return_value
+        )
+        async_collection.find.side_effect = RuntimeError("server selection timeout")
+        fetch = async_to_sync(afetch_recent_mongo_licenses)
+
+        fetch(limit=5)
+        fetch(limit=5)
+        self.assertEqual(get_mongo_circuit_state()["state"], "open")
+
+        async_collection.find.reset_mock()
+        self.assertEqual(fetch(limit=5), [])
+        ok, message = sync_to_mongo({"license_key": "FixedKey123@abc", "machine_id": "DESKTOP-123"})
+
+        async_collection.find.assert_not_called()
+        collection.bulk_write.assert_not_called()
+        self.assertFalse(ok)
+        self.assertIn("circuit open", message)
+
+    @patch("pymongo.MongoClient")
+    def test_half_open_probe_closes_breaker_when_ping_succeeds(self, client_class_mock):
+        _mongo_breaker.record_failure("timeout", now=0)
+        _mongo_breaker.record_failure("timeout", now=0)
+
+        with patch("licenses.services.threading.Thread") as thread_mock:
+            self.assertFalse(_mongo_breaker.allow_request(now=31))
+        self.assertEqual(get_mongo_circuit_state()["state"], "half_open")
+        thread_mock.return_value.start.assert_called_once()
+
+        _mongo_breaker._probe()
+
+        client_class_mock.return_value.admin.command.assert_called_once_with("ping")
+        self.assertEqual(get_mongo_circuit_state()["state"], "closed")
+
+    @patch("pymongo.MongoClient")
+    def test_failed_half_open_probe_reopens_breaker(self, client_class_mock):
+        client_class_mock.return_value.admin.command.side_effect = RuntimeError("still down")
+        _mongo_breaker.record_failure("timeout", now=0)
+        _mongo_breaker.record_failure("timeout", now=0)
+        with patch("licenses.services.threading.Thread"):
+            _mongo_breaker.allow_request(now=31)
+
+        _mongo_breaker._probe()
+
+        self.assertEqual(get_mongo_circuit_state()["state"], "open")
+        self.assertEqual(get_mongo_circuit_state()["last_error"], "still down")
+
+    @patch("licenses.views.afetch_recent_mongo_licenses", return_value=[])
+    def test_dashboard_warns_while_breaker_is_open(self, _mongo_fetch_mock):
+        user = get_user_model().objects.create_user(
+            username="operator_one", password="strong-password-123"
+        )
+        self.client.force_login(user)
+        _mongo_breaker.record_failure("timeout")
+        _mongo_breaker.record_failure("timeout")
+
+        response = self.client.get(reverse("licenses:dashboard"))
+
+        self.assertEqual(response.context["mongo_circuit"]["state"], "open")
+        self.assertContains(response, "MongoDB is unreachable")
+
+
+class RecentMongoLicensesCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        close_mongo_clients()
+        self.addCleanup(close_mongo_clients)
+        config_patcher = patch(
+            "licenses.services.get_runtime_mongo_config",
+            return_value={
+                "mongo_uri": "mongodb://pos-cluster.example:27017",
+                "mongo_db": "license_db",
+                "mongo_collection": "license_keys",
+            },
+        )
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+
+    def _collection(self, client_class_mock):
+        collection = client_class_mock.return_value.__getitem__.return_value.__getitem__.return_value
+        collection.find.return_value.sort.return_value.limit.return_value = _AsyncDocuments(
+            [
+                {
+                    "license_key": "RemoteKey123@abc",
+                    "machine_id": "DESKTOP-REMOTE1",
+                    "generated_at": datetime(2026, 2, 13, 12, 0),
+                }
+            ]
+        )
+        return collection
+
+    @patch("pymongo.AsyncMongoClient")
+    async def test_repeated_fetches_are_served_from_cache(self, client_class_mock):
+        collection = self._collection(client_class_mock)
+
+        first = await afetch_recent_mongo_licenses(limit=100)
+        second = await afetch_recent_mongo_licenses(limit=100)
+
+        self.assertEqual(first, second)
+        self.assertEqual(second[0].machine_id, "DESKTOP-REMOTE1")
+        self.assertEqual(second[0].generated_at.tzinfo, datetime_timezone.utc)
+        collection.find.assert_called_once()
+
+    @patch("pymongo.MongoClient")
+    @patch("pymongo.AsyncMongoClient")
+    def test_successful_sync_invalidates_cached_result(self, client_class_mock, _sync_client_mock):
+        collection = self._collection(client_class_mock)
+        fetch = async_to_sync(afetch_recent_mongo_licenses)
+        fetch(limit=100)
+
+        sync_to_mongo({"license_key": "FixedKey123@abc", "machine_id": "DESKTOP-123"})
+        fetch(limit=100)
+
+        self.assertEqual(collection.find.call_count, 2)
+
+    @patch("pymongo.AsyncMongoClient")
+    async def test_failed_fetch_is_not_cached(self, client_class_mock):
+        collection = self._collection(client_class_mock)
+        collection.find.side_effect = [RuntimeError("timeout"), collection.find.return_value]
+
+        self.assertEqual(await afetch_recent_mongo_licenses(limit=100), [])
+        self.assertEqual(len(await afetch_recent_mongo_licenses(limit=100)), 1)
+
+    @patch("pymongo.AsyncMongoClient")
+    def test_fetch_past_deadline_still_fills_cache_after_request_loop_closes(
+        self, client_class_mock
+    ):
+        collection = self._collection(client_class_mock)
+        release = threading.Event()
+        documents = collection.find.return_value.sort.return_value.limit.return_value
+
+        class _SlowDocuments(_AsyncDocuments):
+            async def __anext__(self):
+                await asyncio.to_thread(release.wait, 5)
+                return await super().__anext__()
+
+        collection.find.return_value.sort.return_value.limit.return_value = _SlowDocuments(
+            documents.documents
+        )
+
+        async def _request():
+            task = asyncio.ensure_future(afetch_recent_mongo_licenses(limit=100))
+            return await await_with_deadline(task, time.monotonic() + 0.05)
+
+        # Same shape as an async view under runserver: the request loop is
+        # closed, and its pending tasks cancelled, once the response is done.
+        self.assertEqual(async_to_sync(_request)(), (None, True))
+        release.set()
+
+        cache_key = _mongo_recent_cache_key(get_runtime_mongo_config(), 100, None)
+        deadline = time.monotonic() + 5
+        while cache.get(cache_key) is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        records = async_to_sync(afetch_recent_mongo_licenses)(limit=100)
+        self.assertEqual(records[0].machine_id, "DESKTOP-REMOTE1")
+        collection.find.assert_called_once()
+
+class _AsyncDocuments:
+    def __init__(self, documents):
+        self.documents = list(documents)
+
+    def __aiter__(self):
+        self._iterator = iter(self.documents)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class LicenseStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        close_mongo_clients()
+        self.addCleanup(close_mongo_clients)
+        config_patcher = patch(
+            "licenses.services.get_runtime_mongo_config",
+            return_value={
+                "mongo_uri": "mongodb://pos-cluster.example:27017",
+                "mongo_db": "license_db",
+                "mongo_collection": "license_keys",
+            },
+        )
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+
+    def _create(self, machine_id, license_key, generated_at, valid_until=None):
+        item = GeneratedLicense.objects.create(machine_id=machine_id, license_key=license_key)
+        GeneratedLicense.objects.filter(id=item.id).update(
+            generated_at=generated_at, valid_until=valid_until or generated_at + timedelta(minutes=10)
+        )
+
+    def test_local_stats_are_aggregated_in_one_query(self):
+        now = timezone.now()
+        self._create("DESKTOP-1", "KeyOne@abc", now, now + timedelta(minutes=10))
+        self._create("DESKTOP-2", "KeyTwo@abc", now - timedelta(days=2))
+        self._create("DESKTOP-3", "KeyThree@abc", now - timedelta(days=3), now - timedelta(days=1))
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = get_local_license_stats(now=now)
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(stats["total_keys"], 3)
+        self.assertEqual(stats["today_keys"], 1)
+        self.assertEqual(stats["unique_machines"], 3)
+        self.assertEqual(stats["expired_keys_count"], 2)
+        self.assertEqual(stats["last_generated"], now)
+
+    def test_validity_filters_are_plain_valid_until_ranges(self):
+        for status in ("valid", "expired"):
+            sql = str(filter_generated_licenses(status=status).query)
+            self.assertIn("valid_until", sql)
+            self.assertNotIn("IS NULL", sql)
+
+    def test_license_saved_without_valid_until_gets_one(self):
+        item = GeneratedLicense.objects.create(machine_id="DESKTOP-1", license_key="KeyOne@abc")
+
+        self.assertEqual(item.valid_until, item.generated_at + timedelta(minutes=10))
+
+    @patch("pymongo.AsyncMongoClient")
+    async def test_mongo_stats_use_cached_aggregation(self, client_class_mock):
+        collection = client_class_mock.return_value.__getitem__.return_value.__getitem__.return_value
+        cursor = AsyncMock()
+        collection.aggregate = AsyncMock(return_value=cursor)
+        cursor.to_list.return_value = [
+            {
+                "_id": None,
+                "total_keys": 5,
+                "today_keys": 2,
+                "unique_machines": 4,
+                "expired_keys_count": 1,
+                "last_generated": datetime(2026, 2, 13, 12, 0),
+            }
+        ]
+
+        first = await afetch_mongo_license_stats()
+        second = await afetch_mongo_license_stats()
+
+        self.assertEqual(first, second)
+        self.assertEqual(second["total_keys"], 5)
+        self.assertEqual(second["last_generated"].tzinfo, datetime_timezone.utc)
+        collection.aggregate.assert_awaited_once()
+
+    @patch("pymongo.AsyncMongoClient")
+    async def test_async_mongo_stats_use_async_aggregation(self, client_class_mock):
+        collection = client_class_mock.return_value.__getitem__.return_value.__getitem__.return_value
+        cursor = AsyncMock()
+        cursor.to_list.return_value = [{"_id": None, "total_keys": 3, "unique_machines": 2}]
+        collection.aggregate = AsyncMock(return_value=cursor)
+
+        stats = await afetch_mongo_license_stats()
+
+        self.assertEqual(stats["total_keys"], 3)
+        self.assertEqual(stats["unique_machines"], 2)
+        self.assertIsNone(stats["last_generated"])
+
+    @patch("licenses.services.afetch_mongo_license_stats")
+    async def test_combined_stats_take_larger_figure_per_metric(self, mongo_stats_mock):
+        now = timezone.now()
+        await sync_to_async(self._create)("DESKTOP-1", "KeyOne@abc", now, now + timedelta(minutes=10))
+        await sync_to_async(self._create)("DESKTOP-2", "KeyTwo@abc", now, now + timedelta(minutes=10))
+        mongo_stats_mock.return_value = {
+            "total_keys": 7,
+            "today_keys": 1,
+            "unique_machines": 6,
+            "expired_keys_count": 5,
+            "last_generated": now - timedelta(days=1),
+        }
+
+        stats, remote_delayed = await aget_license_stats(now=now)
+
+        self.assertFalse(remote_delayed)
+        self.assertEqual(stats["total_keys"], 7)
+        self.assertEqual(stats["today_keys"], 2)
+        self.assertEqual(stats["unique_machines"], 6)
+        self.assertEqual(stats["expired_keys_count"], 5)
+        self.assertEqual(stats["last_generated"], now)
+
+
+class LicenseBrowserTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        for index in range(5):
+            item = GeneratedLicense.objects.create(
+                machine_id=f"DESKTOP-{index}",
+                license_key=f"BrowseKey{index}@abc",
+                customer_name="Alice" if index % 2 == 0 else "Bob",
+            )
+            GeneratedLicense.objects.filter(id=item.id).update(
+                generated_at=self.now - timedelta(days=index),
+                valid_until=self.now + timedelta(minutes=10) if index == 0 else self.now - timedelta(days=index),
+            )
+
+    def _machines(self, page):
+        return [item.machine_id for item in page["items"]]
+
+    def test_pages_seek_forward_and_back_without_offset(self):
+        with CaptureQueriesContext(connection) as queries:
+            first = browse_licenses(filter_generated_licenses(), page_size=2)
+            second = browse_licenses(filter_generated_licenses(), after=first["next_cursor"], page_size=2)
+            third = browse_licenses(filter_generated_licenses(), after=second["next_cursor"], page_size=2)
+
+        self.assertEqual(self._machines(first), ["DESKTOP-0", "DESKTOP-1"])
+        self.assertEqual(self._machines(second), ["DESKTOP-2", "DESKTOP-3"])
+        self.assertEqual(self._machines(third), ["DESKTOP-4"])
+        self.assertEqual(first["previous_cursor"], "")
+        self.assertEqual(third["next_cursor"], "")
+        self.assertFalse(any("OFFSET" in query["sql"].upper() for query in queries))
+
+        back = browse_licenses(filter_generated_licenses(), before=third["previous_cursor"], page_size=2)
+        self.assertEqual(self._machines(back), ["DESKTOP-2", "DESKTOP-3"])
+        self.assertTrue(back["previous_cursor"])
+        self.assertTrue(back["next_cursor"])
+
+    def test_same_timestamp_rows_are_ordered_by_id(self):
+        GeneratedLicense.objects.update(generated_at=self.now)
+
+        first = browse_licenses(filter_generated_licenses(), page_size=3)
+        second = browse_licenses(filter_generated_licenses(), after=first["next_cursor"], page_size=3)
+
+        self.assertEqual(len(set(self._machines(first)) | set(self._machines(second))), 5)
+
+    def test_filters_by_status_prefix_customer_and_date(self):
+        self.assertEqual(
+            self._machines(browse_licenses(filter_generated_licenses(status="valid", now=self.now))),
+            ["DESKTOP-0"],
+        )
+        self.assertEqual(
+            len(browse_licenses(filter_generated_licenses(status="expired", now=self.now))["items"]),
+            4,
+        )
+        self.assertEqual(
+            self._machines(browse_licenses(filter_generated_licenses(machine_prefix="desktop-3"))),
+            ["DESKTOP-3"],
+        )
+        self.assertEqual(
+            self._machines(browse_licenses(filter_generated_licenses(customer="bo"))),
+            ["DESKTOP-1", "DESKTOP-3"],
+        )
+        day = timezone.localtime(self.now - timedelta(days=2)).date()
+        self.assertEqual(
+            self._machines(browse_licenses(filter_generated_licenses(date_from=day, date_to=day))),
+            ["DESKTOP-2"],
+        )
+
+    def test_validity_is_annotated_in_query(self):
+        GeneratedLicense.objects.create(machine_id="DESKTOP-NEW", license_key="FreshKey@abc")
+
+        rows = dict(
+            annotate_license_validity(GeneratedLicense.objects.all(), now=self.now).values_list(
+                "machine_id", "is_valid"
+            )
+        )
+
+        self.assertTrue(rows["DESKTOP-0"])
+        self.assertTrue(rows["DESKTOP-NEW"])
+        self.assertFalse(rows["DESKTOP-3"])
+
+    def test_pages_are_built_from_slotted_records(self):
+        page = browse_licenses(filter_generated_licenses(), page_size=2)
+
+        self.assertTrue(all(isinstance(item, LicenseRecord) for item in page["items"]))
+        self.assertFalse(hasattr(page["items"][0], "__dict__"))
+        self.assertTrue(page["items"][0].is_valid)
+
+    def test_invalid_cursor_starts_from_first_page(self):
+        page = browse_licenses(filter_generated_licenses(), after="not-a-cursor", page_size=2)
+
+        self.assertEqual(self._machines(page), ["DESKTOP-0", "DESKTOP-1"])
+
+    def test_license_list_view_renders_filtered_page(self):
+        user = get_user_model().objects.create_user(
+            username="operator_one", password="strong-password-123"
+        )
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("licenses:license_list"), {"status": "expired", "customer": "Bob"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item.machine_id for item in response.context["licenses"]], ["DESKTOP-1", "DESKTOP-3"]
+        )
+        self.assertTrue(all(item.status == "expired" for item in response.context["licenses"]))
+        self.assertEqual(response.context["filter_query"], "status=expired&customer=Bob")
+
+
+class LicenseChangesFeedTests(TestCase):
+    def setUp(self):
+        self.first = GeneratedLicense.objects.create(
+            machine_id="DESKTOP-1",
+            license_key="Key@one",
+            valid_until=timezone.now() + timedelta(minutes=5),
+        )
+
+    @override_settings(LICENSE_CHANGES_OVERLAP_SECONDS=0)
+    def test_feed_returns_only_rows_changed_after_cursor(self):
+        cursor = license_changes_cursor()
+        GeneratedLicense.objects.create(
+            machine_id="DESKTOP-2",
+            license_key="Key@two",
+            valid_until=timezone.now() - timedelta(minutes=1),
+        )
+
+        changes = fetch_license_changes(cursor)
+
+        self.assertEqual([item.machine_id for item in changes["items"]], ["DESKTOP-2"])
+        self.assertFalse(changes["items"][0].is_valid)
+        self.assertFalse(changes["has_more"])
+        self.assertEqual(changes["cursor"], license_changes_cursor())
+
+        self.first.note = "renewed"
+        self.first.save()
+        changes = fetch_license_changes(changes["cursor"])
+
+        self.assertEqual([item.machine_id for item in changes["items"]], ["DESKTOP-1"])
+        self.assertEqual(fetch_license_changes(changes["cursor"])["items"], [])
+
+    @override_settings(LICENSE_CHANGES_OVERLAP_SECONDS=0)
+    def test_feed_pages_with_has_more(self):
+        cursor = license_changes_cursor()
+        for index in range(3):
+            GeneratedLicense.objects.create(machine_id=f"DESKTOP-P{index}", license_key=f"Key@p{index}")
+
+        first_page = fetch_license_changes(cursor, limit=2)
+        second_page = fetch_license_changes(first_page["cursor"], limit=2)
+
+        self.assertTrue(first_page["has_more"])
+        self.assertEqual(len(first_page["items"]), 2)
+        self.assertEqual([item.machine_id for item in second_page["items"]], ["DESKTOP-P2"])
+        self.assertFalse(second_page["has_more"])
+
+    def test_feed_resends_rows_committed_late_behind_cursor(self):
+        GeneratedLicense.objects.filter(pk=self.first.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=1)
+        )
+        cursor = license_changes_cursor()
+        seen = GeneratedLicense.objects.create(machine_id="DESKTOP-2", license_key="Key@two")
+        changes = fetch_license_changes(cursor)
+        self.assertEqual([item.machine_id for item in changes["items"]], ["DESKTOP-2"])
+
+        # Stamped before DESKTOP-2 but committed after the client read past it.
+        late = GeneratedLicense.objects.create(machine_id="DESKTOP-LATE", license_key="Key@late")
+        GeneratedLicense.objects.filter(pk=late.pk).update(updated_at=seen.updated_at - timedelta(seconds=1))
+        changes = fetch_license_changes(changes["cursor"])
+
+        self.assertEqual([item.machine_id for item in changes["items"]], ["DESKTOP-LATE"])
+        self.assertEqual(changes["cursor"], license_changes_cursor())
+
+    def test_missing_cursor_returns_current_cursor_without_rows(self):
+        changes = fetch_license_changes("")
+
+        self.assertEqual(changes["items"], [])
+        self.assertEqual(changes["cursor"], license_changes_cursor())
+
+    def test_changes_view_returns_compact_rows(self):
+        user = get_user_model().objects.create_user(username="operator", password="strong-password-123")
+        self.client.force_login(user)
+        cursor = license_changes_cursor()
+        GeneratedLicense.objects.create(
+            machine_id="DESKTOP-2",
+            license_key="Key@two",
+            valid_until=timezone.now() + timedelta(minutes=5),
+        )
+
+        response = self.client.get(reverse("licenses:license_changes"), {"since": cursor})
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual([item["machine_id"] for item in payload["licenses"]], ["DESKTOP-2"])
+        self.assertEqual(payload["licenses"][0]["status"], "valid")
+        self.assertEqual(payload["cursor"], license_changes_cursor())
+
+
+class LicenseEventHubTests(TestCase):
+    async def test_publish_from_another_thread_fans_out_to_every_subscriber(self):
+        hub = LicenseEventHub()
+        first = hub.subscribe()
+        second = hub.subscribe()
+        try:
+            await asyncio.to_thread(hub.publish, "license-generated", {"machine_id": "DESKTOP-1"})
+
+            for queue in (first, second):
+                self.assertEqual(
+                    await asyncio.wait_for(queue.get(), timeout=1),
+                    ("license-generated", {"machine_id": "DESKTOP-1"}),
+                )
+        finally:
+            hub.unsubscribe(first)
+            hub.unsubscribe(second)
+        self.assertEqual(hub.subscriber_count(), 0)
+
+    async def test_full_queue_drops_oldest_event(self):
+        queue = asyncio.Queue(maxsize=2)
+        for index in range(3):
+            LicenseEventHub._deliver(queue, ("license-generated", index))
+
+        self.assertEqual([queue.get_nowait()[1], queue.get_nowait()[1]], [1, 2])
+
+    async def test_expiry_check_publishes_machines_past_valid_until(self):
+        now = timezone.now()
+        await GeneratedLicense.objects.acreate(
+            machine_id="DESKTOP-1", license_key="Key@one", valid_until=now - timedelta(seconds=5)
+        )
+        await GeneratedLicense.objects.acreate(
+            machine_id="DESKTOP-2", license_key="Key@two", valid_until=now + timedelta(seconds=30)
+        )
+        hub = LicenseEventHub()
+        queue = hub.subscribe()
+        try:
+            machine_ids = await hub.publish_expired(now - timedelta(minutes=1), now)
+            wait = await hub.next_expiry_wait(now)
+            event = await asyncio.wait_for(queue.get(), timeout=1)
+        finally:
+            hub.unsubscribe(queue)
+
+        self.assertEqual(machine_ids, ["DESKTOP-1"])
+        self.assertEqual(event, ("license-expired", {"machine_ids": ["DESKTOP-1"]}))
+        self.assertAlmostEqual(wait, 30, delta=1)
+
+    def test_generating_a_license_publishes_after_commit(self):
+        with override_settings(LICENSE_API_TOKENS=["provisioner:secret-token"]):
+            with patch("licenses.views.publish_license_event") as publish_mock:
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.post(
+                        reverse("licenses:api_generate_license"),
+                        data=json.dumps({"machine_id": "DESKTOP-1"}),
+                        content_type="application/json",
+                        HTTP_AUTHORIZATION="Bearer secret-token",
+                    )
+
+        self.assertEqual(response.status_code, 201)
+        event, data = publish_mock.call_args.args
+        self.assertEqual(event, "license-generated")
+        self.assertEqual(data["machine_id"], "DESKTOP-1")
+        self.assertEqual(data["status"], "valid")
+
+    def test_events_view_needs_asgi(self):
+        user = get_user_model().objects.create_user(username="operator", password="strong-password-123")
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("licenses:license_events"))
+
+        self.assertEqual(response.status_code, 503)
+
+    async def test_events_view_streams_published_events(self):
+        user = await get_user_model().objects.acreate_user(username="operator", password="strong-password-123")
+        await self.async_client.aforce_login(user)
+        hub = LicenseEventHub()
+
+        with patch("licenses.views.license_event_hub", hub):
+            response = await self.async_client.get(reverse("licenses:license_events"))
+            stream = aiter(response.streaming_content)
+            try:
+                self.assertEqual(await anext(stream), b"retry: 5000\n\n")
+                hub.publish("license-generated", {"machine_id": "DESKTOP-1"})
+                chunk = await asyncio.wait_for(anext(stream), timeout=1)
+            finally:
+                for queue in list(hub._subscribers):
+                    hub.unsubscribe(queue)
+
+        self.assertTrue(response["Content-Type"].startswith("text/event-stream"))
+        self.assertEqual(chunk, b'event: license-generated\ndata: {"machine_id":"DESKTOP-1"}\n\n')
+
+
+class MergeRecentLicensesTests(TestCase):
+    def _records(self, prefix, minutes, pulled):
+        now = timezone.now()
+        for minute in minutes:
+            pulled.append(f"{prefix}{minute}")
+            yield LicenseRecord(
+                license_key=f"{prefix}Key{minute}@abc",
+                machine_id=f"{prefix}-{minute}",
+                generated_at=now - timedelta(minutes=minute),
+            )
+
+    def test_merge_interleaves_sorted_sources_and_stops_at_limit(self):
+        pulled = []
+        local_items = self._records("LOCAL", [0, 2, 4, 6, 8, 10], pulled)
+        mongo_items = self._records("REMOTE", [1, 3, 5, 7, 9], pulled)
+
+        merged = list(_merge_recent_licenses(local_items, mongo_items, limit=3))
+
+        self.assertEqual([item.machine_id for item in merged], ["LOCAL-0", "REMOTE-1", "LOCAL-2"])
+        self.assertLessEqual(len(pulled), 5)
+        self.assertNotIn("LOCAL10", pulled)
+
+    def test_merge_dedupes_synced_copy_of_same_machine_and_key(self):
+        now = timezone.now()
+        local_items = [LicenseRecord(license_key="SameKey@abc", machine_id="DESKTOP-1", generated_at=now)]
+        mongo_items = [
+            LicenseRecord(
+                license_key="SameKey@abc",
+                machine_id="DESKTOP-1",
+                generated_at=now - timedelta(minutes=1),
+                source="mongo",
+            )
+        ]
+
+        merged = list(_merge_recent_licenses(local_items, mongo_items, limit=10))
+
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(merged[0].source, "")
+
+    def test_merge_keeps_different_machines_sharing_a_key(self):
+        now = timezone.now()
+        local_items = [
+            LicenseRecord(license_key="SameKey@abc", machine_id="STORE-00101", generated_at=now),
+            LicenseRecord(license_key="SameKey@abc", machine_id="STORE-00020", generated_at=now),
+        ]
+
+        merged = list(_merge_recent_licenses(local_items, [], limit=10))
+
+        self.assertEqual([item.machine_id for item in merged], ["STORE-00101", "STORE-00020"])
+
+
+class MachineImportTests(TestCase):
+    csv_text = (
+        "Machine_ID,customer_name,contact_email,note\n"
+        "desktop-1,Alice,ALICE@EXAMPLE.COM,first\n"
+        "ab,Short,,\n"
+        "pos-123e4567-e89b-12d3-a456-426614174000,Browser,,\n"
+        "DESKTOP-2,Bob,,\n"
+        "DESKTOP-1,Again,,\n"
+        "DESKTOP-3,Carol,,\n"
+    )
+
+    def setUp(self):
+        config_patcher = patch(
+            "licenses.services.get_runtime_mongo_config",
+            return_value={
+                "mongo_uri": "mongodb://pos-cluster.example:27017",
+                "mongo_db": "license_db",
+                "mongo_collection": "license_keys",
+            },
+        )
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+
+    def test_import_generates_keys_and_reports_row_errors(self):
+        GeneratedLicense.objects.create(machine_id="DESKTOP-2", license_key="OldKey@abc", customer_name="Old")
+
+        report = import_machine_licenses_csv(
+            io.StringIO(self.csv_text), generated_by="importer", chunk_size=2
+        )
+
+        self.assertEqual(report["rows"], 6)
+        self.assertEqual(report["imported"], 3)
+        self.assertEqual([error["line"] for error in report["errors"]], [3, 4, 6])
+        self.assertIn("first seen on line 2", report["errors"][2]["error"])
+        self.assertEqual(GeneratedLicense.objects.count(), 3)
+        alice = GeneratedLicense.objects.get(machine_id="DESKTOP-1")
+        self.assertEqual(alice.contact_email, "alice@example.com")
+        self.assertEqual(alice.license_key, generate_machine_license_key("DESKTOP-1", generated_at=alice.generated_at))
+        bob = GeneratedLicense.objects.get(machine_id="DESKTOP-2")
+        self.assertEqual(bob.customer_name, "Bob")
+        self.assertNotEqual(bob.license_key, "OldKey@abc")
+        self.assertEqual(MongoSyncOutbox.objects.count(), 3)
+
+    def test_import_keeps_rows_whose_key_another_machine_already_has(self):
+        generated_at = timezone.now()
+        shared_key = generate_machine_license_key("DESKTOP-3", generated_at=generated_at)
+        GeneratedLicense.objects.create(machine_id="DESKTOP-OTHER", license_key=shared_key)
+
+        report = import_machine_licenses_csv(
+            io.StringIO(self.csv_text), generated_by="importer", generated_at=generated_at
+        )
+
+        self.assertEqual(report["imported"], 3)
+        self.assertEqual(GeneratedLicense.objects.filter(license_key=shared_key).count(), 2)
+
+    def test_import_requires_machine_id_header(self):
+        report = import_machine_licenses_csv(io.StringIO("name\nx\n"), generated_by="importer")
+
+        self.assertEqual(report["imported"], 0)
+        self.assertIn("machine_id", report["errors"][0]["error"])
+
+    def test_import_command_reads_csv_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as handle:
+            handle.write(self.csv_text)
+        self.addCleanup(os.remove, handle.name)
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+
+        call_command("import_machines", handle.name, stdout=stdout, stderr=stderr)
+
+        self.assertIn("Imported 3 of 6 rows (3 errors).", stdout.getvalue())
+        self.assertIn("line 3 (AB)", stderr.getvalue())
+        self.assertEqual(GeneratedLicense.objects.count(), 3)
+
+    def test_upload_view_imports_for_superuser(self):
+        admin_user = get_user_model().objects.create_superuser(
+            username="admin_one", password="strong-password-123"
+        )
+        self.client.force_login(admin_user)
+        upload = SimpleUploadedFile("machines.csv", self.csv_text.encode("utf-8"), content_type="text/csv")
+
+        response = self.client.post(reverse("licenses:import_machines"), {"csv_file": upload})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["report"]["imported"], 3)
+        self.assertEqual(len(response.context["shown_errors"]), 3)
+        self.assertEqual(GeneratedLicense.objects.get(machine_id="DESKTOP-3").generated_by, "admin_one")
+
+
+class LicenseExportTests(TestCase):
+    def setUp(self):
+        base = datetime(2026, 3, 1, 12, 0, 0, 123456, tzinfo=datetime_timezone.utc)
+        self.older = GeneratedLicense.objects.create(
+            machine_id="DESKTOP-OLD", license_key="Key@old", customer_name="Old, Co"
+        )
+        self.newer = GeneratedLicense.objects.create(
+            machine_id="DESKTOP-NEW", license_key="Key@new", customer_name="New"
+        )
+        GeneratedLicense.objects.filter(pk=self.older.pk).update(generated_at=base - timedelta(days=1))
+        GeneratedLicense.objects.filter(pk=self.newer.pk).update(generated_at=base)
+        self.base = base
+
+    def test_csv_lines_stream_newest_first_in_chunks(self):
+        chunks = list(iter_license_export_lines(iter_license_export_records(chunk_size=1), "csv", chunk_size=1))
+
+        self.assertEqual(len(chunks), 2)
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+        self.assertEqual([row["machine_id"] for row in rows], ["DESKTOP-NEW", "DESKTOP-OLD"])
+        self.assertEqual(rows[1]["customer_name"], "Old, Co")
+        self.assertEqual(rows[0]["source"], "license_manager_web")
+
+    def test_ndjson_lines_merge_mongo_and_skip_synced_duplicates(self):
+        mongo_cursor = [
+            {
+                "license_key": "Key@remote",
+                "machine_id": "DESKTOP-REMOTE",
+                "generated_at": self.base + timedelta(hours=1),
+            },
+            {
+                "license_key": "Key@new",
+                "machine_id": "DESKTOP-NEW",
+                "generated_at": self.base.replace(microsecond=123000, tzinfo=None),
+            },
+        ]
+
+        with patch("licenses.services._mongo_breaker.record_success") as record_success:
+            lines = "".join(
+                iter_license_export_lines(iter_license_export_records(mongo_cursor), "ndjson")
+            ).splitlines()
+
+        documents = [json.loads(line) for line in lines]
+        self.assertEqual(
+            [document["machine_id"] for document in documents],
+            ["DESKTOP-REMOTE", "DESKTOP-NEW", "DESKTOP-OLD"],
+        )
+        self.assertEqual(documents[0]["license_key"], "Key@remote")
+        self.assertIn(".123456", documents[1]["generated_at"])
+        record_success.assert_called_once()
+
+    def test_machines_sharing_a_key_and_timestamp_are_all_exported(self):
+        shared = GeneratedLicense.objects.create(machine_id="DESKTOP-SHARED", license_key="Key@new")
+        GeneratedLicense.objects.filter(pk=shared.pk).update(generated_at=self.base)
+        mongo_cursor = [
+            {"license_key": "Key@new", "machine_id": "DESKTOP-NEW", "generated_at": self.base},
+        ]
+
+        with patch("licenses.services._mongo_breaker.record_success"):
+            records = list(iter_license_export_records(mongo_cursor))
+
+        self.assertEqual(
+            sorted(record.machine_id for record in records),
+            ["DESKTOP-NEW", "DESKTOP-OLD", "DESKTOP-SHARED"],
+        )
+
+    def test_export_view_streams_csv_for_superuser(self):
+        admin_user = get_user_model().objects.create_superuser(
+            username="admin_one", password="strong-password-123"
+        )
+        self.client.force_login(admin_user)
+
+        response = self.client.get(reverse("licenses:export_licenses"), {"format": "csv"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        self.assertIn('.csv"', response["Content-Disposition"])
+        body = b"".join(response.streaming_content).decode("utf-8")
+        self.assertIn("DESKTOP-NEW", body)
+
+    async def test_export_view_streams_async_chunks_under_asgi(self):
+        admin_user = await get_user_model().objects.acreate_superuser(
+            username="admin_one", password="strong-password-123"
+        )
+        await self.async_client.aforce_login(admin_user)
+
+        response = await self.async_client.get(reverse("licenses:export_licenses"), {"format": "ndjson"})
+
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        lines = b"".join(chunks).decode("utf-8").splitlines()
+        self.assertEqual(
+            [json.loads(line)["machine_id"] for line in lines], ["DESKTOP-NEW", "DESKTOP-OLD"]
+        )
+
+    def test_export_view_reports_unavailable_mongo(self):
+        admin_user = get_user_model().objects.create_superuser(
+            username="admin_one", password="strong-password-123"
+        )
+        self.client.force_login(admin_user)
+
+        with patch("licenses.views.open_mongo_export_cursor", return_value=(None, "Mongo URI empty.")):
+            response = self.client.get(
+                reverse("licenses:export_licenses"), {"format": "ndjson", "include_mongo": "1"}
+            )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.content.decode("utf-8"), "Mongo URI empty.")
+
+    def test_export_view_is_superuser_only(self):
+        user = get_user_model().objects.create_user(username="operator", password="strong-password-123")
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("licenses:export_licenses"))
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_export_command_writes_ndjson_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "licenses.ndjson")
+            call_command("export_licenses", "--format", "ndjson", "--output", output_path, stderr=io.StringIO())
+            with open(output_path, encoding="utf-8") as handle:
+                lines = handle.read().splitlines()
+
+        self.assertEqual([json.loads(line)["license_key"] for line in lines], ["Key@new", "Key@old"])
+
+
+@override_settings(LICENSE_API_TOKENS=["provisioner:secret-token"], LICENSE_API_BATCH_MAX=3)
+class LicenseApiTests(TestCase):
+    def setUp(self):
+        config_patcher = patch(
+            "licenses.services.get_runtime_mongo_config",
+            return_value={
+                "mongo_uri": "mongodb://pos-cluster.example:27017",
+                "mongo_db": "license_db",
+                "mongo_collection": "license_keys",
+            },
+        )
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+        self.auth = {"HTTP_AUTHORIZATION": "Bearer secret-token"}
+
+    def _post(self, name, payload, **extra):
+        return self.client.post(
+            reverse(name), data=json.dumps(payload), content_type="application/json", **{**self.auth, **extra}
+        )
+
+    def test_requests_without_valid_token_are_rejected(self):
+        response = self._post(
+            "licenses:api_generate_license", {"machine_id": "DESKTOP-1"}, HTTP_AUTHORIZATION="Bearer wrong"
+        )
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Bearer")
+        self.assertFalse(GeneratedLicense.objects.exists())
+
+    def test_generate_saves_license_and_queues_mongo_sync(self):
+        response = self._post("licenses:api_generate_license", {"machine_id": "desktop-1", "customer_name": "Alice"})
+
+        self.assertEqual(response.status_code, 201)
+        payload = response.json()
+        record = GeneratedLicense.objects.get(machine_id="DESKTOP-1")
+        self.assertEqual(payload["license_key"], record.license_key)
+        self.assertEqual(record.generated_by, "api:provisioner")
+        self.assertTrue(payload["mongo"]["queued"])
+        self.assertEqual(MongoSyncOutbox.objects.count(), 1)
+        self.assertNotIn(b": ", response.content)
+
+    def test_generate_rejects_invalid_machine_id(self):
+        response = self._post("licenses:api_generate_license", {"machine_id": "ab"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.json())
+
+    def test_batch_generate_returns_keys_and_per_item_errors(self):
+        response = self._post(
+            "licenses:api_batch_generate",
+            {"machines": ["desktop-1", {"machine_id": "ab"}, {"machine_id": "DESKTOP-1"}]},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual([item["machine_id"] for item in payload["licenses"]], ["DESKTOP-1"])
+        self.assertEqual([error["index"] for error in payload["errors"]], [1, 2])
+        self.assertEqual(
+            payload["licenses"][0]["license_key"],
+            GeneratedLicense.objects.get(machine_id="DESKTOP-1").license_key,
+        )
+
+    def test_batch_generate_enforces_batch_limit(self):
+        response = self._post("licenses:api_batch_generate", {"machines": ["DESKTOP-1"] * 4})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(GeneratedLicense.objects.exists())
+
+    def test_lookup_returns_license_with_validity(self):
+        GeneratedLicense.objects.create(
+            machine_id="DESKTOP-1",
+            license_key="Key@one",
+            valid_until=timezone.now() + timedelta(minutes=5),
+        )
+
+        response = self.client.get(reverse("licenses:api_lookup_license"), {"machine_id": "desktop-1"}, **self.auth)
+        missing = self.client.get(reverse("licenses:api_lookup_license"), {"machine_id": "DESKTOP-9"}, **self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["license_key"], "Key@one")
+        self.assertTrue(response.json()["is_valid"])
+        self.assertEqual(missing.status_code, 404)
+
+
+class MongoLicenseMirrorTests(TestCase):
+    def setUp(self):
+        close_mongo_clients()
+        self.addCleanup(close_mongo_clients)
+        config_patcher = patch(
+            "licenses.services.get_runtime_mongo_config",
+            return_value={
+                "mongo_uri": "mongodb://pos-cluster.example:27017",
+                "mongo_db": "license_db",
+                "mongo_collection": "license_keys",
+            },
+        )
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+        client_patcher = patch("pymongo.MongoClient")
+        client_class_mock = client_patcher.start()
+        self.addCleanup(client_patcher.stop)
+        self.collection = (
+            client_class_mock.return_value.__getitem__.return_value.__getitem__.return_value
+        )
+        self.documents = []
+        self.collection.find.return_value.sort.return_value.batch_size.side_effect = (
+            lambda _size: list(self.documents)
+        )
+
+    def _document(self, machine_id, license_key, minute):
+        return {
+            "machine_id": machine_id,
+            "license_key": license_key,
+            "customer_name": "Remote User",
+            "generated_at": datetime(2026, 2, 13, 12, minute),
+            "created_at": datetime(2026, 2, 13, 12, minute),
+        }
+
+    def test_first_sync_mirrors_all_documents_and_stores_watermark(self):
+        self.documents = [
+            self._document("DESKTOP-1", "KeyOne@abc", 0),
+            self._document("DESKTOP-2", "KeyTwo@abc", 5),
+        ]
+
+        self.assertEqual(sync_mongo_license_mirror(), 2)
+
+        self.assertEqual(MongoLicenseMirror.objects.count(), 2)
+        self.assertEqual(self.collection.find.call_args.args[0], {})
+        self.assertEqual(
+            MongoMirrorState.objects.get().watermark,
+            datetime(2026, 2, 13, 12, 5, tzinfo=datetime_timezone.utc),
+        )
+
+    def test_next_sync_only_requests_documents_after_watermark(self):
+        self.documents = [self._document("DESKTOP-1", "KeyOne@abc", 0)]
+        sync_mongo_license_mirror()
+
+        self.documents = [self._document("DESKTOP-1", "KeyOneNew@abc", 10)]
+        sync_mongo_license_mirror()
+
+        query = self.collection.find.call_args.args[0]
+        watermark = datetime(2026, 2, 13, 12, 0, tzinfo=datetime_timezone.utc)
+        self.assertEqual(query["$or"][0], {"generated_at": {"$gte": watermark}})
+        mirrored = MongoLicenseMirror.objects.get()
+        self.assertEqual(mirrored.license_key, "KeyOneNew@abc")
+
+    @override_settings(LICENSE_MONGO_MIRROR_ENABLED=True)
+    @patch("licenses.views.afetch_recent_mongo_licenses")
+    def test_dashboard_reads_mirror_instead_of_mongo_when_enabled(self, mongo_fetch_mock):
+        self.documents = [self._document("DESKTOP-REMOTE1", "RemoteKey@abc", 0)]
+        sync_mongo_license_mirror()
+        user = get_user_model().objects.create_user(
+            username="operator_one", password="strong-password-123"
+        )
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("licenses:dashboard"))
+
+        mongo_fetch_mock.assert_not_called()
+        self.assertEqual(response.context["total_keys"], 1)
+        self.assertEqual(response.context["expired_keys_count"], 1)
+
+
+class MongoSyncOutboxTests(TestCase):
+    def setUp(self):
+        config_patcher = patch(
+            "licenses.services.get_runtime_mongo_config",
+            return_value={
+                "mongo_uri": "mongodb://pos-cluster.example:27017",
+                "mongo_db": "license_db",
+                "mongo_collection": "license_keys",
+            },
+        )
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+        self.generated_at = timezone.now()
+
+    def _enqueue(self):
+        return enqueue_mongo_sync(
+            {
+                "license_key": "FixedKey123@abc",
+                "machine_id": "DESKTOP-123",
+                "status": "valid",
+                "generated_at": self.generated_at,
+                "valid_until": self.generated_at + timedelta(minutes=10),
+            }
+        )
+
+    @patch("licenses.services.sync_many_to_mongo")
+    def test_drain_pushes_entry_and_removes_it(self, sync_mock):
+        synced_payloads = []
+
+        def fake_sync(payloads):
+            synced_payloads.extend(payloads)
+            return [(True, "Saved to MongoDB.")] * len(synced_payloads)
+
+        sync_mock.side_effect = fake_sync
+        self.assertEqual(self._enqueue(), (True, "Queued for MongoDB sync."))
+
+        self.assertEqual(drain_mongo_sync_outbox(), (1, 0))
+
+        self.assertEqual(MongoSyncOutbox.objects.count(), 0)
+        payload = synced_payloads[0]
+        self.assertEqual(payload["machine_id"], "DESKTOP-123")
+        self.assertEqual(payload["generated_at"], self.generated_at)
+
+    @patch(
+        "licenses.services.sync_many_to_mongo",
+        side_effect=lambda payloads: [(False, "Mongo sync failed: timeout") for _item in payloads],
+    )
+    def test_failed_drain_keeps_entry_with_exponential_backoff(self, _sync_mock):
+        self._enqueue()
+        now = timezone.now()
+
+        self.assertEqual(drain_mongo_sync_outbox(now=now), (0, 1))
+        entry = MongoSyncOutbox.objects.get()
+        self.assertEqual(entry.attempts, 1)
+        self.assertEqual(entry.last_error, "Mongo sync failed: timeout")
+        self.assertEqual(entry.next_attempt_at, now + timedelta(seconds=5))
+
+        self.assertEqual(drain_mongo_sync_outbox(now=now), (0, 0))
+        drain_mongo_sync_outbox(now=entry.next_attempt_at)
+        entry.refresh_from_db()
+        self.assertEqual(entry.attempts, 2)
+        self.assertEqual(entry.next_attempt_at, now + timedelta(seconds=5 + 10))
+
+    @patch("licenses.services.sync_many_to_mongo")
+    def test_failed_older_key_is_not_retried_over_newer_key(self, sync_mock):
+        synced_keys = []
+
+        def fake_sync(payloads):
+            payloads = list(payloads)
+            synced_keys.extend(payload["license_key"] for payload in payloads)
+            return [(payload["license_key"] != "Key1@abc", "Mongo sync failed: timeout") for payload in payloads]
+
+        sync_mock.side_effect = fake_sync
+        enqueue_mongo_sync({"license_key": "Key1@abc", "machine_id": "DESKTOP-1"})
+        self.assertEqual(drain_mongo_sync_outbox(now=timezone.now()), (0, 1))
+
+        enqueue_mongo_sync({"license_key": "Key2@abc", "machine_id": "DESKTOP-1"})
+        self.assertEqual(drain_mongo_sync_outbox(now=timezone.now()), (1, 0))
+        self.assertEqual(drain_mongo_sync_outbox(now=timezone.now() + timedelta(minutes=5)), (0, 0))
+
+        self.assertEqual(synced_keys, ["Key1@abc", "Key2@abc"])
+        self.assertFalse(MongoSyncOutbox.objects.exists())
+
+    @patch("licenses.services.sync_many_to_mongo")
+    def test_drain_skips_rows_superseded_in_the_same_batch(self, sync_mock):
+        synced_keys = []
+
+        def fake_sync(payloads):
+            payloads = list(payloads)
+            synced_keys.extend(payload["license_key"] for payload in payloads)
+            return [(True, "Saved to MongoDB.")] * len(payloads)
+
+        sync_mock.side_effect = fake_sync
+        MongoSyncOutbox.objects.create(machine_id="DESKTOP-1", license_key="Key1@abc", payload={"license_key": "Key1@abc"})
+        MongoSyncOutbox.objects.create(machine_id="DESKTOP-1", license_key="Key2@abc", payload={"license_key": "Key2@abc"})
+
+        self.assertEqual(drain_mongo_sync_outbox(), (1, 0))
+
+        self.assertEqual(synced_keys, ["Key2@abc"])
+        self.assertFalse(MongoSyncOutbox.objects.exists())
+
+    @patch("licenses.services.sync_many_to_mongo")
+    def test_dashboard_post_queues_sync_without_calling_mongo(self, sync_mock):
+        user = get_user_model().objects.create_user(
+            username="operator_one", password="strong-password-123"
+        )
+        self.client.force_login(user)
+
+        with patch("licenses.views.afetch_recent_mongo_licenses", return_value=[]):
+            self.client.post(reverse("licenses:dashboard"), {"machine_id": "desktop-123"})
+
+        sync_mock.assert_not_called()
+        entry = MongoSyncOutbox.objects.get()
+        self.assertEqual(entry.machine_id, "DESKTOP-123")
+        self.assertEqual(entry.license_key, GeneratedLicense.objects.get().license_key)
+
+
+class SaveLicenseForMachineTests(TestCase):
+    def _save(self, license_key, note, generated_at):
+        return _save_license_for_machine(
+            machine_id="DESKTOP-123",
+            license_key=license_key,
+            customer_name="Alice",
+            contact_email="alice@example.com",
+            note=note,
+            generated_by="operator_one",
+            source="license_manager_page",
+            generated_at=generated_at,
+            valid_until=generated_at + timedelta(minutes=10),
+        )
+
+    def test_save_is_a_single_upsert_statement(self):
+        generated_at = timezone.now()
+        self._save("FirstKey123@abc", "first", generated_at)
+
+        with CaptureQueriesContext(connection) as queries:
+            self._save("NextKey456@abc", "second", generated_at + timedelta(minutes=10))
+
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertIn("ON CONFLICT", queries.captured_queries[0]["sql"].upper())
+        record = GeneratedLicense.objects.get()
+        self.assertEqual(record.license_key, "NextKey456@abc")
+        self.assertEqual(record.note, "second")
+        self.assertEqual(record.generated_at, generated_at + timedelta(minutes=10))
+
+    def test_machine_id_is_unique(self):
+        GeneratedLicense.objects.create(machine_id="DESKTOP-123", license_key="FirstKey123@abc")
+
+        with self.assertRaises(IntegrityError):
+            GeneratedLicense.objects.create(machine_id="DESKTOP-123", license_key="NextKey456@abc")
+
 
 class AuthWorkflowTests(TestCase):
     def setUp(self):
@@ -154,14 +1799,25 @@ class DashboardViewTests(TestCase):
             password="strong-password-123",
         )
         self.client.force_login(self.user)
+        stats_patcher = patch("licenses.services.afetch_mongo_license_stats", return_value=None)
+        self.mongo_stats_mock = stats_patcher.start()
+        self.addCleanup(stats_patcher.stop)
+
+    def _remote_stats(self, **overrides):
+        stats = {
+            "total_keys": 0,
+            "today_keys": 0,
+            "unique_machines": 0,
+            "expired_keys_count": 0,
+            "last_generated": None,
+        }
+        stats.update(overrides)
+        return stats
 
     def _messages(self, response):
         return [message.message for message in get_messages(response.wsgi_request)]
 
-    def _record_value(self, item, key):
-        return item.get(key) if isinstance(item, dict) else getattr(item, key)
-
-    @patch("licenses.views.fetch_recent_mongo_licenses", return_value=[])
+    @patch("licenses.views.afetch_recent_mongo_licenses", return_value=[])
     def test_get_dashboard_with_empty_state(self, _mongo_fetch_mock):
         response = self.client.get(self.url)
 
@@ -171,7 +1827,7 @@ class DashboardViewTests(TestCase):
         self.assertEqual(response.context["unique_machines"], 0)
         self.assertIsNone(response.context["last_generated"])
 
-    @patch("licenses.views.fetch_recent_mongo_licenses", return_value=[])
+    @patch("licenses.views.afetch_recent_mongo_licenses", return_value=[])
     def test_dashboard_prefills_form_from_query_parameters(self, _mongo_fetch_mock):
         response = self.client.get(
             self.url,
@@ -218,7 +1874,7 @@ class DashboardViewTests(TestCase):
             )
         )
 
-    @patch("licenses.views.sync_to_mongo", return_value=(True, "Saved to MongoDB."))
+    @patch("licenses.views.enqueue_mongo_sync", return_value=(True, "Queued for MongoDB sync."))
     def test_post_valid_machine_creates_license_with_normalized_data(self, sync_mock):
         response = self.client.post(
             self.url,
@@ -254,7 +1910,7 @@ class DashboardViewTests(TestCase):
         sync_mock.assert_called_once()
 
     @patch("licenses.views.generate_machine_license_key", return_value="FixedKey123@abc")
-    @patch("licenses.views.sync_to_mongo", return_value=(True, "Saved to MongoDB."))
+    @patch("licenses.views.enqueue_mongo_sync", return_value=(True, "Queued for MongoDB sync."))
     def test_reposting_same_machine_updates_existing_license_record(
         self, _sync_mock, _key_mock
     ):
@@ -272,7 +1928,7 @@ class DashboardViewTests(TestCase):
         "licenses.views.generate_machine_license_key",
         side_effect=["FixedKey123@abc", "NextKey456@abc"],
     )
-    @patch("licenses.views.sync_to_mongo", return_value=(True, "Saved to MongoDB."))
+    @patch("licenses.views.enqueue_mongo_sync", return_value=(True, "Queued for MongoDB sync."))
     def test_reposting_same_machine_with_new_key_rewrites_single_row(
         self, _sync_mock, _key_mock
     ):
@@ -343,7 +1999,7 @@ class DashboardViewTests(TestCase):
         )
 
     @patch(
-        "licenses.views.sync_to_mongo",
+        "licenses.views.enqueue_mongo_sync",
         return_value=(False, "Mongo URI empty. Saved only in local Django database."),
     )
     def test_sync_warning_is_added_when_mongo_sync_fails(self, _sync_mock):
@@ -358,21 +2014,26 @@ class DashboardViewTests(TestCase):
             )
         )
 
-    @patch("licenses.views.fetch_recent_mongo_licenses")
+    @patch("licenses.views.afetch_recent_mongo_licenses")
     def test_dashboard_uses_mongo_records_when_local_is_empty(self, mongo_fetch_mock):
         mongo_fetch_mock.return_value = [
-            {
-                "license_key": "AbC123@xyZ9",
-                "machine_id": "DESKTOP-REMOTE1",
-                "customer_name": "Remote User",
-                "contact_email": "remote@example.com",
-                "note": "from atlas",
-                "generated_by": "Admin01",
-                "generated_at": timezone.now(),
-                "status": "generated",
-                "source": "license_manager_page",
-            }
+            LicenseRecord.from_document(
+                {
+                    "license_key": "AbC123@xyZ9",
+                    "machine_id": "DESKTOP-REMOTE1",
+                    "customer_name": "Remote User",
+                    "contact_email": "remote@example.com",
+                    "note": "from atlas",
+                    "generated_by": "Admin01",
+                    "generated_at": timezone.now(),
+                    "status": "generated",
+                    "source": "license_manager_page",
+                }
+            )
         ]
+        self.mongo_stats_mock.return_value = self._remote_stats(
+            total_keys=1, today_keys=1, unique_machines=1, last_generated=timezone.now()
+        )
 
         response = self.client.get(self.url)
 
@@ -380,12 +2041,33 @@ class DashboardViewTests(TestCase):
         self.assertEqual(response.context["total_keys"], 1)
         self.assertEqual(response.context["today_keys"], 1)
         self.assertEqual(response.context["unique_machines"], 1)
+        self.assertEqual(response.context["recent_licenses"][0].machine_id, "DESKTOP-REMOTE1")
+        mongo_fetch_mock.assert_called_once_with(limit=100)
+
+    @override_settings(LICENSE_MONGO_FETCH_DEADLINE_MS=20)
+    @patch("licenses.views.afetch_recent_mongo_licenses")
+    def test_dashboard_renders_local_data_when_mongo_misses_deadline(self, mongo_fetch_mock):
+        async def slow_fetch(limit):
+            await asyncio.sleep(5)
+            return []
+
+        mongo_fetch_mock.side_effect = slow_fetch
+        GeneratedLicense.objects.create(
+            machine_id="DESKTOP-LOCAL1",
+            license_key="LocalKey123@abc",
+            valid_until=timezone.now() + timedelta(minutes=10),
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["remote_delayed"])
         self.assertEqual(
-            response.context["recent_licenses"][0]["machine_id"], "DESKTOP-REMOTE1"
+            [item.machine_id for item in response.context["recent_licenses"]], ["DESKTOP-LOCAL1"]
         )
-        mongo_fetch_mock.assert_called_once_with(limit=100)
+        self.assertContains(response, "Remote data delayed")
 
-    @patch("licenses.views.fetch_recent_mongo_licenses")
+    @patch("licenses.views.afetch_recent_mongo_licenses")
     def test_dashboard_combines_local_and_mongo_records(self, mongo_fetch_mock):
         GeneratedLicense.objects.create(
             machine_id="DESKTOP-LOCAL1",
@@ -398,32 +2080,34 @@ class DashboardViewTests(TestCase):
             source="license_manager_page",
         )
         mongo_fetch_mock.return_value = [
-            {
-                "license_key": "MongoKey123@xyz",
-                "machine_id": "DESKTOP-REMOTE1",
-                "customer_name": "Remote User",
-                "contact_email": "remote@example.com",
-                "note": "remote",
-                "generated_by": "Admin01",
-                "generated_at": timezone.now() - timedelta(minutes=1),
-                "status": "generated",
-                "source": "license_manager_page",
-            }
+            LicenseRecord.from_document(
+                {
+                    "license_key": "MongoKey123@xyz",
+                    "machine_id": "DESKTOP-REMOTE1",
+                    "customer_name": "Remote User",
+                    "contact_email": "remote@example.com",
+                    "note": "remote",
+                    "generated_by": "Admin01",
+                    "generated_at": timezone.now() - timedelta(minutes=1),
+                    "status": "generated",
+                    "source": "license_manager_page",
+                }
+            )
         ]
+        self.mongo_stats_mock.return_value = self._remote_stats(
+            total_keys=2, today_keys=2, unique_machines=2
+        )
 
         response = self.client.get(self.url)
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context["total_keys"], 2)
-        machines = {
-            item["machine_id"] if isinstance(item, dict) else item.machine_id
-            for item in response.context["recent_licenses"]
-        }
+        machines = {item.machine_id for item in response.context["recent_licenses"]}
         self.assertIn("DESKTOP-LOCAL1", machines)
         self.assertIn("DESKTOP-REMOTE1", machines)
         mongo_fetch_mock.assert_called_once_with(limit=100)
 
-    @patch("licenses.views.fetch_recent_mongo_licenses")
+    @patch("licenses.views.afetch_recent_mongo_licenses")
     def test_dashboard_deduplicates_same_license_key_between_local_and_mongo(
         self, mongo_fetch_mock
     ):
@@ -438,17 +2122,19 @@ class DashboardViewTests(TestCase):
             source="license_manager_page",
         )
         mongo_fetch_mock.return_value = [
-            {
-                "license_key": "SameKey123@abc",
-                "machine_id": "DESKTOP-REMOTE1",
-                "customer_name": "Remote User",
-                "contact_email": "remote@example.com",
-                "note": "remote",
-                "generated_by": "Admin01",
-                "generated_at": timezone.now() + timedelta(minutes=1),
-                "status": "generated",
-                "source": "license_manager_page",
-            }
+            LicenseRecord.from_document(
+                {
+                    "license_key": "SameKey123@abc",
+                    "machine_id": "DESKTOP-REMOTE1",
+                    "customer_name": "Remote User",
+                    "contact_email": "remote@example.com",
+                    "note": "remote",
+                    "generated_by": "Admin01",
+                    "generated_at": timezone.now() + timedelta(minutes=1),
+                    "status": "generated",
+                    "source": "license_manager_page",
+                }
+            )
         ]
 
         response = self.client.get(self.url)
@@ -457,7 +2143,7 @@ class DashboardViewTests(TestCase):
         self.assertEqual(response.context["total_keys"], 1)
         mongo_fetch_mock.assert_called_once_with(limit=100)
 
-    @patch("licenses.views.fetch_recent_mongo_licenses", return_value=[])
+    @patch("licenses.views.afetch_recent_mongo_licenses", return_value=[])
     def test_dashboard_hides_expired_items_from_recent_list(
         self, _mongo_fetch_mock
     ):
@@ -483,7 +2169,7 @@ class DashboardViewTests(TestCase):
         self.assertEqual(response.context["expired_keys_count"], 1)
         self.assertEqual(len(response.context["recent_licenses"]), 0)
 
-    @patch("licenses.views.fetch_recent_mongo_licenses", return_value=[])
+    @patch("licenses.views.afetch_recent_mongo_licenses", return_value=[])
     def test_expired_keys_page_lists_expired_items(self, _mongo_fetch_mock):
         item = GeneratedLicense.objects.create(
             machine_id="DESKTOP-OLD1",
@@ -505,12 +2191,99 @@ class DashboardViewTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context["expired_total"], 1)
         first_item = response.context["expired_licenses"][0]
-        self.assertEqual(self._record_value(first_item, "status"), "expired")
-        self.assertEqual(self._record_value(first_item, "machine_id"), "DESKTOP-OLD1")
+        self.assertEqual(first_item.status, "expired")
+        self.assertEqual(first_item.machine_id, "DESKTOP-OLD1")
         self.assertContains(response, reverse("licenses:dashboard"))
         self.assertContains(response, "machine_id=DESKTOP-OLD1")
 
 
+class ConditionalListingTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="operator_one", password="strong-password-123")
+        self.client.force_login(self.user)
+        patchers = [
+            patch("licenses.services.afetch_mongo_license_stats", return_value=None),
+            patch("licenses.views.afetch_recent_mongo_licenses", return_value=[]),
+            patch(
+                "licenses.services.get_runtime_mongo_config",
+                return_value={"mongo_uri": "", "mongo_db": "license_db", "mongo_collection": "license_keys"},
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_dashboard_answers_not_modified_until_a_license_changes(self):
+        url = reverse("licenses:dashboard")
+        self.client.get(url)
+        first = self.client.get(url)
+        etag = first["ETag"]
+
+        self.assertEqual(first["Cache-Control"], "private, no-cache")
+        self.assertIn("Last-Modified", first)
+        repeat = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(repeat.status_code, 304)
+
+        GeneratedLicense.objects.create(
+            machine_id="DESKTOP-1",
+            license_key="Key@one",
+            valid_until=timezone.now() + timedelta(minutes=5),
+        )
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_validator_is_per_view_and_per_user(self):
+        self.client.get(reverse("licenses:dashboard"))
+        dashboard = self.client.get(reverse("licenses:dashboard"))
+        expired = self.client.get(reverse("licenses:expired_keys"))
+        self.assertNotEqual(dashboard["ETag"], expired["ETag"])
+        self.assertEqual(
+            self.client.get(reverse("licenses:expired_keys"), HTTP_IF_NONE_MATCH=expired["ETag"]).status_code,
+            304,
+        )
+
+        other = get_user_model().objects.create_user(username="operator_two", password="strong-password-123")
+        self.client.force_login(other)
+        response = self.client.get(reverse("licenses:expired_keys"), HTTP_IF_NONE_MATCH=expired["ETag"])
+        self.assertEqual(response.status_code, 200)
+
+    def test_delayed_remote_data_is_not_validated(self):
+        with patch("licenses.views._load_recent_licenses", AsyncMock(return_value=([], True))):
+            response = self.client.get(reverse("licenses:expired_keys"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+    async def test_validator_changes_when_next_key_expires(self):
+        now = timezone.now()
+        await GeneratedLicense.objects.acreate(
+            machine_id="DESKTOP-1", license_key="Key@one", valid_until=now + timedelta(minutes=5)
+        )
+
+        before = await aget_license_listing_validator(now)
+        same = await aget_license_listing_validator(now + timedelta(minutes=1))
+        after = await aget_license_listing_validator(now + timedelta(minutes=6))
+
+        self.assertEqual(before["etag"], same["etag"])
+        self.assertNotEqual(before["etag"], after["etag"])
+        self.assertGreaterEqual(after["last_modified"], now + timedelta(minutes=5))
+
+    async def test_live_mongo_reads_expire_validator_each_cache_period(self):
+        now = datetime(2026, 3, 1, 12, 0, 0, tzinfo=datetime_timezone.utc)
+        with patch(
+            "licenses.services.get_runtime_mongo_config",
+            return_value={"mongo_uri": "mongodb://pos", "mongo_db": "license_db", "mongo_collection": "keys"},
+        ), override_settings(LICENSE_MONGO_RECENT_CACHE_SECONDS=15):
+            first = await aget_license_listing_validator(now)
+            same = await aget_license_listing_validator(now + timedelta(seconds=10))
+            later = await aget_license_listing_validator(now + timedelta(seconds=20))
+
+        self.assertEqual(first["etag"], same["etag"])
+        self.assertNotEqual(first["etag"], later["etag"])
+        self.assertEqual(later["last_modified"], now + timedelta(seconds=15))
+
+
 class UserManagementTests(TestCase):
     def setUp(self):
         self.user_model = get_user_model()
@@ -1,15 +1,24 @@
 from django.urls import path
 
 from .views import (
+    api_batch_generate_view,
+    api_generate_license_view,
+    api_lookup_license_view,
     dashboard_view,
     expired_keys_view,
+    export_licenses_view,
     healthz_view,
+    import_machines_view,
     initial_admin_setup,
+    license_changes_view,
+    license_events_view,
+    license_list_view,
     login_view,
     logout_view,
     user_create_view,
     user_edit_view,
     user_list_view,
+    verify_license_view,
 )
 
 
@@ -17,11 +26,20 @@ app_name = "licenses"
 
 urlpatterns = [
     path("healthz/", healthz_view, name="healthz"),
+    path("api/verify/", verify_license_view, name="verify_license"),
+    path("api/v1/licenses/generate/", api_generate_license_view, name="api_generate_license"),
+    path("api/v1/licenses/batch-generate/", api_batch_generate_view, name="api_batch_generate"),
+    path("api/v1/licenses/lookup/", api_lookup_license_view, name="api_lookup_license"),
     path("", login_view, name="login"),
     path("setup-admin/", initial_admin_setup, name="initial_admin_setup"),
     path("logout/", logout_view, name="logout"),
     path("dashboard/", dashboard_view, name="dashboard"),
     path("expired-keys/", expired_keys_view, name="expired_keys"),
+    path("licenses/", license_list_view, name="license_list"),
+    path("licenses/import/", import_machines_view, name="import_machines"),
+    path("licenses/export/", export_licenses_view, name="export_licenses"),
+    path("licenses/changes/", license_changes_view, name="license_changes"),
+    path("licenses/events/", license_events_view, name="license_events"),
     path("users/", user_list_view, name="user_list"),
     path("users/create/", user_create_view, name="user_create"),
     path("users/<int:user_id>/edit/", user_edit_view, name="user_edit"),
@@ -1,28 +1,79 @@
+import asyncio
+import csv
+import hashlib
+import heapq
+import io
+import json
+import time
 from datetime import datetime, timezone as datetime_timezone
+from functools import wraps
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout, update_session_auth_hash
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.core.paginator import Paginator
+from django.db import transaction
 from django.db.models import Q
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date, urlencode
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
 
 from .models import GeneratedLicense, LicenseRuntimeConfig
 from .services import (
+    LICENSE_EVENT_HEARTBEAT_SECONDS,
+    LICENSE_EXPORT_FORMATS,
+    afetch_mirrored_mongo_licenses,
+    afetch_recent_mongo_licenses,
+    aget_license_listing_validator,
+    aget_license_stats,
+    alicense_changes_cursor,
+    alicense_records,
+    annotate_license_validity,
+    await_with_deadline,
+    browse_licenses,
     calculate_license_valid_until,
+    enqueue_mongo_sync,
+    fetch_license_changes,
+    format_license_event,
     generate_machine_license_key,
-    fetch_recent_mongo_licenses,
+    filter_generated_licenses,
     get_license_key_validity_minutes,
+    get_mongo_fetch_deadline_seconds,
+    get_mongo_circuit_state,
+    get_api_batch_max,
+    get_api_token_client,
     get_runtime_mongo_config,
-    is_browser_style_machine_id,
-    is_machine_id_valid,
+    import_machine_licenses,
+    import_machine_licenses_csv,
+    iter_license_export_lines,
+    iter_license_export_records,
+    is_mongo_mirror_enabled,
+    license_event_hub,
+    machine_id_error,
     normalize_machine_id,
+    open_mongo_export_cursor,
+    publish_license_event,
     save_shared_mongo_config,
-    sync_to_mongo,
+    upsert_generated_licenses,
+    verify_machine_license_key,
+)
+
+LICENSE_API_LOOKUP_FIELDS = (
+    "machine_id",
+    "license_key",
+    "customer_name",
+    "status",
+    "generated_at",
+    "valid_until",
 )
 
 
@@ -38,37 +89,58 @@ def _save_license_for_machine(
     generated_at,
     valid_until,
 ):
-    existing_records = GeneratedLicense.objects.filter(machine_id=machine_id).order_by(
-        "-generated_at", "-id"
+    record = GeneratedLicense(
+        machine_id=machine_id,
+        license_key=license_key,
+        customer_name=customer_name,
+        contact_email=contact_email,
+        note=note,
+        generated_by=generated_by,
+        status="valid",
+        source=source,
+        generated_at=generated_at or timezone.now(),
+        valid_until=valid_until,
     )
-    primary_record = existing_records.first()
+    upsert_generated_licenses([record])
+    return record
+
 
-    if primary_record is None:
-        return GeneratedLicense.objects.create(
+def _generate_license_for_machine(*, machine_id, customer_name, contact_email, note, generated_by):
+    generated_at = timezone.now()
+    valid_until = calculate_license_valid_until(generated_at)
+    license_key = generate_machine_license_key(machine_id, generated_at=generated_at)
+    source_name = settings.LICENSE_SOURCE
+
+    with transaction.atomic():
+        record = _save_license_for_machine(
             machine_id=machine_id,
             license_key=license_key,
             customer_name=customer_name,
             contact_email=contact_email,
             note=note,
             generated_by=generated_by,
-            status="valid",
-            source=source,
+            source=source_name,
+            generated_at=generated_at,
             valid_until=valid_until,
         )
 
-    primary_record.license_key = license_key
-    primary_record.customer_name = customer_name
-    primary_record.contact_email = contact_email
-    primary_record.note = note
-    primary_record.generated_by = generated_by
-    primary_record.status = "valid"
-    primary_record.source = source
-    primary_record.generated_at = generated_at
-    primary_record.valid_until = valid_until
-    primary_record.save()
-
-    existing_records.exclude(pk=primary_record.pk).delete()
-    return primary_record
+        synced, sync_message = enqueue_mongo_sync(
+            {
+                "license_key": license_key,
+                "machine_id": machine_id,
+                "customer_name": customer_name,
+                "contact_email": contact_email,
+                "note": note,
+                "generated_by": generated_by,
+                "status": "valid",
+                "source": source_name,
+                "generated_at": generated_at,
+                "valid_until": valid_until,
+            }
+        )
+        event = _license_change_payload(record, is_valid=True)
+        transaction.on_commit(lambda: publish_license_event("license-generated", event))
+    return record, synced, sync_message
 
 
 def _branding_context():
@@ -97,81 +169,67 @@ def _is_superuser(user):
     return bool(user and user.is_authenticated and user.is_superuser)
 
 
-def _record_value(item, key):
-    if isinstance(item, dict):
-        return item.get(key)
-    return getattr(item, key, None)
-
-
-def _record_local_date(value):
-    if value is None:
-        return None
-    if timezone.is_naive(value):
-        value = value.replace(tzinfo=datetime_timezone.utc)
-    return timezone.localtime(value).date()
-
-
-def _record_local_datetime(value):
-    if value is None:
-        return None
-    if timezone.is_naive(value):
-        value = value.replace(tzinfo=datetime_timezone.utc)
-    return timezone.localtime(value)
-
-
-def _record_set(item, key, value):
-    if isinstance(item, dict):
-        item[key] = value
-    else:
-        setattr(item, key, value)
-
-
 def _merge_recent_licenses(local_items, mongo_items, limit=100):
+    # Both sources are already sorted by generated_at descending, so a lazy
+    # k-way merge only pulls as many rows from each as the page needs.
     minimum_dt = datetime.min.replace(tzinfo=datetime_timezone.utc)
-    merged = list(local_items) + list(mongo_items)
-
-    merged.sort(
-        key=lambda item: _record_local_datetime(_record_value(item, "generated_at")) or minimum_dt,
+    merged = heapq.merge(
+        local_items,
+        mongo_items,
+        key=lambda item: item.generated_at or minimum_dt,
         reverse=True,
     )
 
-    deduped = []
-    seen_keys = set()
+    limit = max(1, int(limit))
+    emitted = 0
+    # Machines can share a key, so a synced copy is one with the same machine
+    # and key.
+    seen_rows = set()
     for item in merged:
-        license_key = (_record_value(item, "license_key") or "").strip()
-        if license_key and license_key in seen_keys:
+        license_key = (item.license_key or "").strip()
+        row_key = (item.machine_id, license_key)
+        if license_key and row_key in seen_rows:
             continue
         if license_key:
-            seen_keys.add(license_key)
-        deduped.append(item)
-        if len(deduped) >= max(1, int(limit)):
-            break
-
-    return deduped
+            seen_rows.add(row_key)
+        yield item
+        emitted += 1
+        if emitted >= limit:
+            return
 
 
 def _annotate_license_status(licenses):
-    now_local = timezone.localtime()
+    now = timezone.now()
     for item in licenses:
-        generated_at = _record_value(item, "generated_at")
-        valid_until = _record_value(item, "valid_until")
-        if valid_until is None and generated_at is not None:
-            valid_until = calculate_license_valid_until(generated_at)
-
-        valid_until_local = _record_local_datetime(valid_until) if valid_until is not None else None
-        is_valid = bool(valid_until_local and valid_until_local >= now_local)
-
-        _record_set(item, "valid_until", valid_until_local)
-        _record_set(item, "status", "valid" if is_valid else "expired")
+        if item.valid_until is None and item.generated_at is not None:
+            item.valid_until = calculate_license_valid_until(item.generated_at)
+        if item.is_valid is None:
+            # Local and mirrored rows carry the SQL is_valid annotation; Mongo documents do not.
+            item.is_valid = item.valid_until is not None and item.valid_until >= now
+        item.status = "valid" if item.is_valid else "expired"
 
     return licenses
 
 
-def _load_recent_licenses(limit=100):
-    local_licenses = list(GeneratedLicense.objects.all()[:limit])
-    mongo_licenses = fetch_recent_mongo_licenses(limit=limit)
-    merged_licenses = _merge_recent_licenses(local_licenses, mongo_licenses, limit=limit)
-    return _annotate_license_status(merged_licenses)
+async def _load_recent_licenses(limit=100, deadline=None):
+    local_licenses = annotate_license_validity(GeneratedLicense.objects.all())[:limit]
+    if is_mongo_mirror_enabled():
+        local_records, mongo_records = await asyncio.gather(
+            alicense_records(local_licenses),
+            afetch_mirrored_mongo_licenses(limit=limit),
+        )
+        remote_delayed = False
+    else:
+        # Query the local database while Mongo is fetched concurrently; a slow
+        # Mongo only costs the deadline.
+        if deadline is None:
+            deadline = time.monotonic() + get_mongo_fetch_deadline_seconds()
+        mongo_task = asyncio.ensure_future(afetch_recent_mongo_licenses(limit=limit))
+        local_records = await alicense_records(local_licenses)
+        mongo_records, remote_delayed = await await_with_deadline(mongo_task, deadline)
+
+    merged_licenses = _merge_recent_licenses(local_records, mongo_records or [], limit=limit)
+    return _annotate_license_status(list(merged_licenses)), remote_delayed
 
 
 def login_view(request):
@@ -206,7 +264,7 @@ def login_view(request):
     return render(request, "licenses/home.html", context)
 
 
-def healthz_view(request):
+async def healthz_view(request):
     response = JsonResponse(
         {
             "status": "ok",
@@ -218,6 +276,177 @@ def healthz_view(request):
     return response
 
 
+def _request_payload(request):
+    if request.method == "GET":
+        return request.GET
+    if (request.content_type or "").startswith("application/json"):
+        try:
+            payload = json.loads(request.body or b"{}")
+        except (TypeError, ValueError):
+            return None
+        return payload if isinstance(payload, dict) else None
+    return request.POST
+
+
+def _isoformat_or_none(value):
+    return value.isoformat() if value is not None else None
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+def verify_license_view(request):
+    payload = _request_payload(request)
+    machine_id = normalize_machine_id((payload or {}).get("machine_id"))
+    license_key = ((payload or {}).get("license_key") or "").strip()
+
+    if payload is None or not machine_id or not license_key:
+        response = JsonResponse(
+            {"valid": False, "error": "machine_id and license_key are required."},
+            status=400,
+        )
+    else:
+        result = verify_machine_license_key(machine_id, license_key)
+        response = JsonResponse(
+            {
+                "valid": result["valid"],
+                "machine_id": result["machine_id"],
+                "window_start": _isoformat_or_none(result["window_start"]),
+                "valid_until": _isoformat_or_none(result["valid_until"]),
+            }
+        )
+
+    response["Access-Control-Allow-Origin"] = "*"
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def _api_response(payload, status=200):
+    response = JsonResponse(payload, status=status, json_dumps_params={"separators": (",", ":")})
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def _api_license_payload(record):
+    return {
+        "machine_id": record.machine_id,
+        "license_key": record.license_key,
+        "generated_at": _isoformat_or_none(record.generated_at),
+        "valid_until": _isoformat_or_none(record.valid_until),
+    }
+
+
+def _api_token_required(view_func):
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        scheme, _, token = (request.headers.get("Authorization") or "").partition(" ")
+        client = get_api_token_client(token) if scheme.lower() == "bearer" else ""
+        if not client:
+            response = _api_response({"error": "A valid API token is required."}, status=401)
+            response["WWW-Authenticate"] = "Bearer"
+            return response
+        request.api_client = client
+        return view_func(request, *args, **kwargs)
+
+    return wrapper
+
+
+def _api_machine_values(item):
+    if isinstance(item, str):
+        item = {"machine_id": item}
+    if not isinstance(item, dict):
+        return None
+    return {
+        "machine_id": normalize_machine_id(item.get("machine_id")),
+        "customer_name": str(item.get("customer_name") or "").strip(),
+        "contact_email": str(item.get("contact_email") or "").strip().lower(),
+        "note": str(item.get("note") or "").strip(),
+    }
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@_api_token_required
+def api_generate_license_view(request):
+    values = _api_machine_values(_request_payload(request))
+    if values is None:
+        return _api_response({"error": "Request body must be a JSON object."}, status=400)
+    machine_error = machine_id_error(values["machine_id"])
+    if machine_error:
+        return _api_response({"error": machine_error}, status=400)
+
+    record, synced, sync_message = _generate_license_for_machine(
+        **values, generated_by=f"api:{request.api_client}"
+    )
+    payload = _api_license_payload(record)
+    payload["mongo"] = {"queued": synced, "message": sync_message}
+    return _api_response(payload, status=201)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@_api_token_required
+def api_batch_generate_view(request):
+    payload = _request_payload(request)
+    machines = (payload or {}).get("machines")
+    if not isinstance(machines, list) or not machines:
+        return _api_response({"error": "machines must be a non-empty list."}, status=400)
+    batch_max = get_api_batch_max()
+    if len(machines) > batch_max:
+        return _api_response({"error": f"At most {batch_max} machines per request."}, status=400)
+
+    errors = []
+    rows = []
+    for index, item in enumerate(machines):
+        values = _api_machine_values(item)
+        if values is None:
+            errors.append({"index": index, "machine_id": "", "error": "Each machine must be an object or string."})
+        else:
+            rows.append((index, values))
+
+    report = import_machine_licenses(
+        rows,
+        generated_by=f"api:{request.api_client}",
+        source=settings.LICENSE_SOURCE,
+        chunk_size=batch_max,
+    )
+    errors.extend(
+        {"index": error["line"], "machine_id": error["machine_id"], "error": error["error"]}
+        for error in report["errors"]
+    )
+    errors.sort(key=lambda error: error["index"])
+    failed = {error["index"] for error in errors}
+    saved_ids = [values["machine_id"] for index, values in rows if index not in failed]
+    saved = GeneratedLicense.objects.filter(machine_id__in=saved_ids).in_bulk(
+        saved_ids, field_name="machine_id"
+    )
+    return _api_response(
+        {
+            "licenses": [_api_license_payload(saved[machine_id]) for machine_id in saved_ids if machine_id in saved],
+            "errors": errors,
+            "mongo": {"queued": bool(saved) and not report["mongo_message"], "message": report["mongo_message"]},
+        },
+    )
+
+
+@require_http_methods(["GET"])
+@_api_token_required
+def api_lookup_license_view(request):
+    machine_id = normalize_machine_id(request.GET.get("machine_id"))
+    if not machine_id:
+        return _api_response({"error": "machine_id is required."}, status=400)
+
+    record = (
+        annotate_license_validity(GeneratedLicense.objects.filter(machine_id=machine_id))
+        .values(*LICENSE_API_LOOKUP_FIELDS, "is_valid")
+        .first()
+    )
+    if record is None:
+        return _api_response({"error": "License not found."}, status=404)
+    for field in ("generated_at", "valid_until"):
+        record[field] = _isoformat_or_none(record[field])
+    return _api_response(record)
+
+
 def initial_admin_setup(request):
     if User.objects.filter(is_superuser=True).exists():
         return redirect("licenses:login")
@@ -272,8 +501,7 @@ def logout_view(request):
     return redirect("licenses:dashboard")
 
 
-@login_required(login_url="licenses:login")
-def dashboard_view(request):
+def _handle_dashboard_form(request):
     generated_key = ""
     generated_machine = "-"
     form_values = {
@@ -342,50 +570,20 @@ def dashboard_view(request):
                 }
             )
 
-            if not is_machine_id_valid(machine_id):
-                messages.error(
-                    request,
-                    "Enter valid Machine ID (3-64 chars: letters, numbers, dot, underscore, hyphen).",
-                )
-            elif is_browser_style_machine_id(machine_id):
-                messages.error(
-                    request,
-                    "POS browser UUID not allowed. Use installer machine ID (example: DESKTOP-XXXXXXX).",
-                )
+            machine_error = machine_id_error(machine_id)
+            if machine_error:
+                messages.error(request, machine_error)
             else:
-                generated_at = timezone.now()
-                valid_until = calculate_license_valid_until(generated_at)
-                generated_key = generate_machine_license_key(machine_id, generated_at=generated_at)
-                generated_machine = machine_id
-                generated_by = request.user.username
-                source_name = settings.LICENSE_SOURCE
-
-                _save_license_for_machine(
+                record, synced, sync_message = _generate_license_for_machine(
                     machine_id=machine_id,
-                    license_key=generated_key,
                     customer_name=customer_name,
                     contact_email=contact_email,
                     note=note,
-                    generated_by=generated_by,
-                    source=source_name,
-                    generated_at=generated_at,
-                    valid_until=valid_until,
-                )
-
-                synced, sync_message = sync_to_mongo(
-                    {
-                        "license_key": generated_key,
-                        "machine_id": machine_id,
-                        "customer_name": customer_name,
-                        "contact_email": contact_email,
-                        "note": note,
-                        "generated_by": generated_by,
-                        "status": "valid",
-                        "source": source_name,
-                        "generated_at": generated_at,
-                        "valid_until": valid_until,
-                    }
+                    generated_by=request.user.username,
                 )
+                generated_key = record.license_key
+                generated_machine = machine_id
+                valid_until = record.valid_until
                 valid_until_text = timezone.localtime(valid_until).strftime("%Y-%m-%d %H:%M:%S")
                 validity_minutes = get_license_key_validity_minutes()
                 messages.success(
@@ -395,58 +593,285 @@ def dashboard_view(request):
                 if not synced:
                     messages.warning(request, sync_message)
 
-    all_recent_licenses = _load_recent_licenses(limit=100)
-    recent_licenses = [
-        item for item in all_recent_licenses if _record_value(item, "status") == "valid"
-    ]
-    expired_keys_count = len(all_recent_licenses) - len(recent_licenses)
-
-    total_keys = len(all_recent_licenses)
-    today = timezone.localtime().date()
-    today_keys = sum(
-        1
-        for item in all_recent_licenses
-        if _record_local_date(_record_value(item, "generated_at")) == today
+    return form_values, mongo_form_values, generated_key, generated_machine
+
+
+def _listing_etag(request, view_name, validator):
+    # The page embeds the user's menu and CSRF token, so those are part of the tag.
+    parts = (
+        view_name,
+        validator["etag"],
+        str(request.user.pk),
+        str(request.user.is_superuser),
+        request.get_full_path(),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
     )
-    unique_machines = len(
-        {
-            _record_value(item, "machine_id")
-            for item in all_recent_licenses
-            if _record_value(item, "machine_id")
-        }
+    return '"%s"' % hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def _conditional_listing_response(request, view_name, validator):
+    etag = _listing_etag(request, view_name, validator)
+    # Flash messages are shown once, so a page carrying them is always rendered.
+    if len(messages.get_messages(request)):
+        return None, etag
+    not_modified = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(validator["last_modified"].timestamp()),
     )
-    last_generated = (
-        _record_value(all_recent_licenses[0], "generated_at") if all_recent_licenses else None
+    return not_modified, etag
+
+
+def _set_listing_validators(response, etag, validator):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(validator["last_modified"].timestamp())
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@login_required(login_url="licenses:login")
+async def dashboard_view(request):
+    validator = None
+    if request.method in ("GET", "HEAD"):
+        validator = await aget_license_listing_validator()
+        not_modified, etag = await sync_to_async(_conditional_listing_response)(request, "dashboard", validator)
+        if not_modified is not None:
+            return not_modified
+
+    # Form handling and rendering touch the session and request.user, which
+    # are sync-only; the listing and stats queries run natively async.
+    form_values, mongo_form_values, generated_key, generated_machine = await sync_to_async(
+        _handle_dashboard_form
+    )(request)
+
+    # Taken before the listing so the first poll re-sends anything written
+    # while the page was being built.
+    changes_cursor = await alicense_changes_cursor()
+    deadline = time.monotonic() + get_mongo_fetch_deadline_seconds()
+    (license_stats, stats_delayed), (all_recent_licenses, remote_delayed) = await asyncio.gather(
+        aget_license_stats(deadline=deadline),
+        _load_recent_licenses(limit=100, deadline=deadline),
     )
+    recent_licenses = [
+        item for item in all_recent_licenses if item.status == "valid"
+    ]
 
     context = {
         "license_email": settings.LICENSE_EMAIL,
         "generated_key": generated_key,
         "generated_machine": generated_machine,
         "recent_licenses": recent_licenses,
-        "expired_keys_count": expired_keys_count,
-        "total_keys": total_keys,
-        "today_keys": today_keys,
-        "unique_machines": unique_machines,
-        "last_generated": last_generated,
+        "expired_keys_count": license_stats["expired_keys_count"],
+        "total_keys": license_stats["total_keys"],
+        "today_keys": license_stats["today_keys"],
+        "unique_machines": license_stats["unique_machines"],
+        "last_generated": license_stats["last_generated"],
         "form_values": form_values,
         "mongo_form_values": mongo_form_values,
+        "mongo_circuit": get_mongo_circuit_state(),
+        "remote_delayed": remote_delayed or stats_delayed,
+        "changes_cursor": changes_cursor,
+    }
+    response = await sync_to_async(render)(request, "licenses/dashboard.html", context)
+    # A page built without the remote data must not be revalidated as complete.
+    if validator is not None and not context["remote_delayed"]:
+        _set_listing_validators(response, etag, validator)
+    return response
+
+
+def _license_change_payload(record, is_valid=None):
+    is_valid = record.is_valid if is_valid is None else is_valid
+    return {
+        "license_key": record.license_key,
+        "machine_id": record.machine_id,
+        "customer_name": record.customer_name,
+        "contact_email": record.contact_email,
+        "note": record.note,
+        "status": "valid" if is_valid else "expired",
+        "source": record.source,
+        "generated_by": record.generated_by,
+        "generated_at": timezone.localtime(record.generated_at).strftime("%Y-%m-%d %H:%M:%S"),
+        "valid_until": _isoformat_or_none(record.valid_until),
+        "valid_until_text": (
+            timezone.localtime(record.valid_until).strftime("%Y-%m-%d %H:%M:%S") if record.valid_until else ""
+        ),
     }
-    return render(request, "licenses/dashboard.html", context)
+
+
+async def _license_event_stream():
+    queue = license_event_hub.subscribe()
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), timeout=LICENSE_EVENT_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_license_event(event, data)
+    finally:
+        license_event_hub.unsubscribe(queue)
 
 
 @login_required(login_url="licenses:login")
-def expired_keys_view(request):
-    recent_licenses = _load_recent_licenses(limit=100)
+async def license_events_view(request):
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI (runserver) an endless stream would pin a worker thread;
+        # the dashboard falls back to polling /licenses/changes/.
+        return HttpResponse("Live events need the ASGI server.", status=503, content_type="text/plain")
+
+    response = StreamingHttpResponse(_license_event_stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-store"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@login_required(login_url="licenses:login")
+@require_http_methods(["GET"])
+def license_changes_view(request):
+    changes = fetch_license_changes(request.GET.get("since"))
+    response = JsonResponse(
+        {
+            "licenses": [_license_change_payload(record) for record in changes["items"]],
+            "cursor": changes["cursor"],
+            "has_more": changes["has_more"],
+        }
+    )
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@login_required(login_url="licenses:login")
+async def expired_keys_view(request):
+    validator = await aget_license_listing_validator()
+    not_modified, etag = await sync_to_async(_conditional_listing_response)(request, "expired_keys", validator)
+    if not_modified is not None:
+        return not_modified
+
+    recent_licenses, remote_delayed = await _load_recent_licenses(limit=100)
     expired_licenses = [
-        item for item in recent_licenses if _record_value(item, "status") == "expired"
+        item for item in recent_licenses if item.status == "expired"
     ]
 
     context = {
         "expired_licenses": expired_licenses,
         "expired_total": len(expired_licenses),
+        "remote_delayed": remote_delayed,
+    }
+    response = await sync_to_async(render)(request, "licenses/expired_keys.html", context)
+    if not remote_delayed:
+        _set_listing_validators(response, etag, validator)
+    return response
+
+
+@login_required(login_url="licenses:login")
+def license_list_view(request):
+    filters = {
+        "status": (request.GET.get("status") or "").strip().lower(),
+        "machine_id": normalize_machine_id(request.GET.get("machine_id")),
+        "customer": (request.GET.get("customer") or "").strip(),
+        "date_from": (request.GET.get("date_from") or "").strip(),
+        "date_to": (request.GET.get("date_to") or "").strip(),
+    }
+    if filters["status"] not in {"valid", "expired"}:
+        filters["status"] = ""
+
+    try:
+        date_from = parse_date(filters["date_from"]) if filters["date_from"] else None
+        date_to = parse_date(filters["date_to"]) if filters["date_to"] else None
+    except ValueError:
+        date_from = date_to = None
+
+    licenses = filter_generated_licenses(
+        status=filters["status"],
+        machine_prefix=filters["machine_id"],
+        customer=filters["customer"],
+        date_from=date_from,
+        date_to=date_to,
+    )
+    page = browse_licenses(
+        licenses,
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
+        page_size=50,
+    )
+
+    context = {
+        "filters": filters,
+        "licenses": _annotate_license_status(page["items"]),
+        "filter_query": urlencode({key: value for key, value in filters.items() if value}),
+        "next_cursor": page["next_cursor"],
+        "previous_cursor": page["previous_cursor"],
+    }
+    return render(request, "licenses/license_list.html", context)
+
+
+@login_required(login_url="licenses:login")
+@user_passes_test(_is_superuser, login_url="licenses:dashboard")
+def import_machines_view(request):
+    report = None
+
+    if request.method == "POST":
+        upload = request.FILES.get("csv_file")
+        if upload is None:
+            messages.error(request, "Choose a CSV file to import.")
+        else:
+            try:
+                report = import_machine_licenses_csv(
+                    io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""),
+                    generated_by=request.user.username,
+                )
+            except (UnicodeDecodeError, csv.Error) as exc:
+                messages.error(request, f"Could not read CSV file: {exc}")
+            else:
+                messages.success(
+                    request,
+                    f"Imported {report['imported']} of {report['rows']} rows "
+                    f"({len(report['errors'])} errors).",
+                )
+                if report["mongo_message"]:
+                    messages.warning(request, report["mongo_message"])
+
+    context = {
+        "report": report,
+        "shown_errors": report["errors"][:200] if report else [],
     }
-    return render(request, "licenses/expired_keys.html", context)
+    return render(request, "licenses/import_machines.html", context)
+
+
+async def _aiter_export_chunks(chunks):
+    # Under ASGI Django would drain a sync iterator with sync_to_async(list),
+    # holding the whole export in memory; pull one chunk per thread hop instead.
+    next_chunk = sync_to_async(next)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
+
+
+@login_required(login_url="licenses:login")
+@user_passes_test(_is_superuser, login_url="licenses:dashboard")
+def export_licenses_view(request):
+    export_format = (request.GET.get("format") or "csv").strip().lower()
+    if export_format not in LICENSE_EXPORT_FORMATS:
+        return HttpResponseBadRequest("Unsupported export format.")
+
+    mongo_cursor = None
+    if request.GET.get("include_mongo") == "1":
+        mongo_cursor, message = open_mongo_export_cursor()
+        if mongo_cursor is None:
+            return HttpResponse(message, status=503, content_type="text/plain")
+
+    lines = iter_license_export_lines(iter_license_export_records(mongo_cursor), export_format)
+    if isinstance(request, ASGIRequest):
+        lines = _aiter_export_chunks(lines)
+    content_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    response = StreamingHttpResponse(lines, content_type=f"{content_type}; charset=utf-8")
+    filename = f"licenses-{timezone.localtime():%Y%m%d-%H%M%S}.{export_format}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["Cache-Control"] = "no-store"
+    return response
 
 
 @login_required(login_url="licenses:login")
@@ -1,4 +1,4 @@
-const CACHE_VERSION = "mmlm-v8";
+const CACHE_VERSION = "mmlm-v10";
 const SHELL_CACHE = `shell-${CACHE_VERSION}`;
 const RUNTIME_CACHE = `runtime-${CACHE_VERSION}`;
 
@@ -13,6 +13,38 @@ const SHELL_ASSETS = [
   "/static/icons/favicon.ico",
 ];
 
+// License pages carry ETag/Last-Modified with "no-cache", so each visit is a
+// conditional request (304 when unchanged); the last validated copy serves offline.
+const REVALIDATED_PAGES = ["/dashboard/", "/expired-keys/"];
+
+function isRevalidatedPage(request) {
+  if (!isSameOrigin(request)) return false;
+  return REVALIDATED_PAGES.includes(new URL(request.url).pathname);
+}
+
+async function fetchRevalidatedPage(request) {
+  const cache = await caches.open(RUNTIME_CACHE);
+  try {
+    const response = await fetch(request);
+    if (response.ok && !response.redirected && response.headers.has("ETag")) {
+      await cache.put(request.url, response.clone());
+    }
+    return response;
+  } catch (error) {
+    const cached = await cache.match(request.url);
+    if (cached) return cached;
+    throw error;
+  }
+}
+
+async function clearRevalidatedPages() {
+  const cache = await caches.open(RUNTIME_CACHE);
+  const keys = await cache.keys();
+  await Promise.all(
+    keys.filter((key) => isRevalidatedPage(key)).map((key) => cache.delete(key))
+  );
+}
+
 function isSameOrigin(request) {
   const url = new URL(request.url);
   return url.origin === self.location.origin;
@@ -61,11 +93,14 @@ self.addEventListener("activate", (event) => {
 
 self.addEventListener("fetch", (event) => {
   const { request } = event;
+  if (request.mode === "navigate" && isSameOrigin(request) && new URL(request.url).pathname === "/logout/") {
+    event.waitUntil(clearRevalidatedPages());
+  }
   if (request.method !== "GET") return;
 
   if (request.mode === "navigate") {
     event.respondWith(
-      fetch(request).catch(async () => {
+      (isRevalidatedPage(request) ? fetchRevalidatedPage(request) : fetch(request)).catch(async () => {
         const cache = await caches.open(SHELL_CACHE);
         const fallback = await cache.match("/");
         return fallback || Response.error();